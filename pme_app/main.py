@@ -3,7 +3,7 @@ FastAPI main application for PME Calculator.
 Production-ready API with comprehensive PME analysis capabilities.
 """
 
-import io
+from typing import Any, Literal
 
 import numpy as np
 import pandas as pd
@@ -248,8 +248,8 @@ async def upload_csv_data(file: UploadFile = File(...)):
         if not file.filename or not file.filename.endswith(".csv"):
             raise HTTPException(status_code=400, detail="File must be a CSV")
 
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
+        # Parse straight from the spooled upload instead of copying it to memory
+        df = pd.read_csv(file.file)
 
         return {
             "filename": file.filename,
@@ -262,9 +262,11 @@ async def upload_csv_data(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
 
 
-@app.post("/api/upload/fund")
-async def upload_fund_data(file: UploadFile = File(...)):
-    """Upload fund data file (CSV/Excel)."""
+async def _handle_data_upload(
+    file: UploadFile, data_type: Literal["fund", "index"]
+) -> dict[str, Any]:
+    """Shared fund/index upload: parse the CSV/Excel file and summarise it."""
+    label = data_type.capitalize()
     try:
         if not file.filename or not (
             file.filename.endswith(".csv") or file.filename.endswith(".xlsx")
@@ -273,15 +275,14 @@ async def upload_fund_data(file: UploadFile = File(...)):
                 status_code=400, detail="File must be CSV or Excel format"
             )
 
-        contents = await file.read()
-
+        # Parse straight from the spooled upload instead of copying it to memory
         if file.filename.endswith(".csv"):
-            df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
+            df = pd.read_csv(file.file)
         else:
-            df = pd.read_excel(io.BytesIO(contents))
+            df = pd.read_excel(file.file)
 
         logger.info(
-            "Fund data uploaded",
+            f"{label} data uploaded",
             extra={
                 "filename": file.filename,
                 "rows": len(df),
@@ -291,63 +292,31 @@ async def upload_fund_data(file: UploadFile = File(...)):
 
         return {
             "status": "success",
-            "message": "Fund data uploaded successfully",
+            "message": f"{label} data uploaded successfully",
             "filename": file.filename,
-            "file_id": f"fund_{file.filename}_{len(df)}",
+            "file_id": f"{data_type}_{file.filename}_{len(df)}",
             "rows": len(df),
             "columns": list(df.columns),
             "rows_processed": len(df),
             "columns_detected": len(df.columns),
             "data_preview": df.head().to_dict("records"),
-            "data_type": "fund",
+            "data_type": data_type,
         }
     except Exception as e:
-        logger.error(f"Fund upload failed: {str(e)}")
+        logger.error(f"{label} upload failed: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
 
 
+@app.post("/api/upload/fund")
+async def upload_fund_data(file: UploadFile = File(...)):
+    """Upload fund data file (CSV/Excel)."""
+    return await _handle_data_upload(file, "fund")
+
+
 @app.post("/api/upload/index")
 async def upload_index_data(file: UploadFile = File(...)):
     """Upload market index data file (CSV/Excel)."""
-    try:
-        if not file.filename or not (
-            file.filename.endswith(".csv") or file.filename.endswith(".xlsx")
-        ):
-            raise HTTPException(
-                status_code=400, detail="File must be CSV or Excel format"
-            )
-
-        contents = await file.read()
-
-        if file.filename.endswith(".csv"):
-            df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
-        else:
-            df = pd.read_excel(io.BytesIO(contents))
-
-        logger.info(
-            "Index data uploaded",
-            extra={
-                "filename": file.filename,
-                "rows": len(df),
-                "columns": list(df.columns),
-            },
-        )
-
-        return {
-            "status": "success",
-            "message": "Index data uploaded successfully",
-            "filename": file.filename,
-            "file_id": f"index_{file.filename}_{len(df)}",
-            "rows": len(df),
-            "columns": list(df.columns),
-            "rows_processed": len(df),
-            "columns_detected": len(df.columns),
-            "data_preview": df.head().to_dict("records"),
-            "data_type": "index",
-        }
-    except Exception as e:
-        logger.error(f"Index upload failed: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
+    return await _handle_data_upload(file, "index")
 
 
 # Analysis execution endpoints
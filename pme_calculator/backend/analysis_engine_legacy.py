@@ -244,21 +244,30 @@ class PMEAnalysisEngine:
             if self.fund_data is None:
                 raise ValueError("Could not read fund data file")
 
-            logger.info(
-                f"Fund data loaded: {len(self.fund_data)} rows, {len(self.fund_data.columns)} columns"
-            )
-            logger.info(f"Fund data columns: {list(self.fund_data.columns)}")
-
-            return {
-                "success": True,
-                "rows": len(self.fund_data),
-                "columns": list(self.fund_data.columns),
-            }
+            return self._ingest_fund_df(self.fund_data)
 
         except Exception as e:
             logger.error(f"Failed to load fund data: {e}")
             return {"success": False, "error": str(e)}
 
+    def load_fund_dataframe(self, df: pd.DataFrame) -> dict[str, Any]:
+        """Load fund data already held in memory, skipping the CSV round trip."""
+        return self._ingest_fund_df(df)
+
+    def _ingest_fund_df(self, df: pd.DataFrame) -> dict[str, Any]:
+        """Adopt ``df`` as the fund data and summarize its shape."""
+        self.fund_data = df
+        logger.info(
+            f"Fund data loaded: {len(self.fund_data)} rows, {len(self.fund_data.columns)} columns"
+        )
+        logger.info(f"Fund data columns: {list(self.fund_data.columns)}")
+
+        return {
+            "success": True,
+            "rows": len(self.fund_data),
+            "columns": list(self.fund_data.columns),
+        }
+
     def load_index_data(self, file_path: str) -> dict[str, Any]:
         """Load and validate index data with enhanced error handling."""
         try:
@@ -389,8 +389,9 @@ class ApiBridge:
         """Clean up temporary files."""
         for temp_file in self.temp_files:
             try:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
+                os.unlink(temp_file)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logger.error(
                     f"Error cleaning up temp file {temp_file}: {str(e)}", exc_info=True
@@ -0,0 +1,67 @@
+"""
+Session fixtures for the backend system test scripts.
+
+The sample frames are built, and the fund CSV written, once per session;
+tests must treat them as read-only.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+import structlog
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import sample_data
+
+
+@pytest.fixture(scope="module")
+def quiet_structlog():
+    """
+    Drop a script's debug progress lines unless structlog is already set up.
+    Requested by the scripts themselves, so tests/ keeps its own logging.
+    """
+    if structlog.is_configured():
+        yield
+        return
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    yield
+    structlog.reset_defaults()
+
+
+@pytest.fixture(scope="session")
+def fund_df():
+    return sample_data.fund_frame()
+
+
+@pytest.fixture(scope="session")
+def benchmark_df():
+    return sample_data.benchmark_frame()
+
+
+@pytest.fixture(scope="session")
+def fund_csv(tmp_path_factory, fund_df):
+    path = tmp_path_factory.mktemp("pme") / "fund.csv"
+    fund_df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def analysis_engine():
+    """Shared engine; tests load their own fund data before calculating."""
+    from analysis_engine import PMEAnalysisEngine
+
+    return PMEAnalysisEngine()
+
+
+@pytest.fixture(scope="session")
+def chart_engine():
+    from chart_engine import ChartEngine
+
+    return ChartEngine()
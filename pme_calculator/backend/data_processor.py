@@ -110,6 +110,15 @@ class IntelligentDataProcessor:
 
     def __init__(self):
         self.column_patterns = self._initialize_column_patterns()
+        self._compiled_patterns = {
+            data_type: [re.compile(pattern) for pattern in patterns]
+            for data_type, patterns in self.column_patterns.items()
+        }
+        # One alternation per type rules out non-matching types in a single pass
+        self._type_matchers = {
+            data_type: re.compile("|".join(f"(?:{p})" for p in patterns))
+            for data_type, patterns in self.column_patterns.items()
+        }
         self.date_formats = [
             "%Y-%m-%d",
             "%m/%d/%Y",
@@ -219,12 +228,12 @@ class IntelligentDataProcessor:
         best_match = DataType.UNKNOWN
         best_confidence = 0.0
 
-        for data_type, patterns in self.column_patterns.items():
+        for data_type, patterns in self._compiled_patterns.items():
+            if not self._type_matchers[data_type].match(column_name_lower):
+                continue
             for pattern in patterns:
-                if re.match(pattern, column_name_lower):
-                    confidence = len(re.findall(pattern, column_name_lower)) / len(
-                        patterns
-                    )
+                if pattern.match(column_name_lower):
+                    confidence = len(pattern.findall(column_name_lower)) / len(patterns)
                     if confidence > best_confidence:
                         best_match = data_type
                         best_confidence = confidence
@@ -248,6 +257,22 @@ class IntelligentDataProcessor:
             confidence=best_confidence,
         )
 
+    def detect_column_types(
+        self,
+        df: pd.DataFrame,
+        samples: dict[str, list[Any]] | None = None,
+        sample_size: int = 10,
+    ) -> list[ColumnMapping]:
+        """
+        Detect the type of every column in a DataFrame in one call.
+        Precomputed sample values can be passed in to avoid re-sampling.
+        """
+        if samples is None:
+            samples = {
+                col: df[col].dropna().head(sample_size).tolist() for col in df.columns
+            }
+        return [self.detect_column_type(col, samples[col]) for col in df.columns]
+
     def _analyze_sample_values(
         self, sample_values: list[Any]
     ) -> tuple[DataType, float]:
@@ -396,11 +421,7 @@ class IntelligentDataProcessor:
         list(df.columns)
 
         # Detect and map columns
-        column_mappings = []
-        for col in df.columns:
-            sample_values = df[col].dropna().head(10).tolist()
-            mapping = self.detect_column_type(col, sample_values)
-            column_mappings.append(mapping)
+        column_mappings = self.detect_column_types(df)
 
         # Apply transformations
         transformed_df = self._apply_transformations(df, column_mappings)
@@ -13,6 +13,7 @@ try:
 except ImportError:
     from .config import settings
 from logger import get_logger
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel, select
@@ -48,9 +49,28 @@ logger = get_logger(__name__)
 # Database configuration using typed settings
 DATABASE_URL = settings.DATABASE_URL
 
+# Connection pool sizing; connections are reused across requests instead of
+# being opened per session, and checked with a ping before being handed out
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 10
+DB_POOL_RECYCLE = 3600  # seconds
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    """Pool settings for ``url``; SQLite keeps the pool class SQLAlchemy picks."""
+    options: dict[str, Any] = {"pool_pre_ping": True}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+
 # Create async engine
 engine = create_async_engine(
-    DATABASE_URL, echo=True, future=True  # Set to False in production
+    DATABASE_URL, echo=settings.DEBUG, future=True, **_engine_options(DATABASE_URL)
 )
 
 # Create async session factory
@@ -140,6 +160,26 @@ async def create_upload_record(
         return None
 
 
+async def create_upload_records(
+    session: AsyncSession, rows: list[dict[str, Any]]
+) -> int:
+    """
+    Insert several upload file records in a single transaction.
+    """
+    try:
+        if UploadFileMeta is None:
+            return 0
+
+        session.add_all([UploadFileMeta(**row) for row in rows])
+        await session.commit()
+        logger.info(f"Created {len(rows)} upload records")
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Error creating {len(rows)} upload records: {e}")
+        await session.rollback()
+        return 0
+
+
 async def update_upload_record(
     session: AsyncSession, upload_id: int, update_data: dict[str, Any]
 ) -> Any | None:
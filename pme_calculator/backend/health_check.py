@@ -12,6 +12,7 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import sample_data
 
 # Set up structured logging
 from logger import get_logger
@@ -126,49 +127,30 @@ def test_analysis_engine():
     try:
         from analysis_engine import PMEAnalysisEngine
 
-        # Create test data
-        test_data = pd.DataFrame(
-            {
-                "date": pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "cashflow": [-1000, -500, 0, 200, 300, 0, 400, 500],
-                "nav": [1000, 1400, 1450, 1350, 1600, 1700, 1600, 1800],
-            }
-        )
-
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            test_data.to_csv(f.name, index=False)
-            temp_file = f.name
+        # Shared sample quarters
+        test_data = sample_data.fund_frame()
 
-        try:
-            # Test analysis engine
-            engine = PMEAnalysisEngine()
-            result = engine.load_fund_data(temp_file)
-            if result["success"]:
-                logger.info("   ✅ Fund data loaded")
+        # Test analysis engine on the in-memory frame, no CSV round trip
+        engine = PMEAnalysisEngine()
+        result = engine.load_fund_dataframe(test_data)
+        if result["success"]:
+            logger.info("   ✅ Fund data loaded")
+        else:
+            errors.append(
+                f"Fund data loading failed: {result.get('error', 'Unknown error')}"
+            )
+            logger.error(
+                f"   ❌ Fund data loading failed: {result.get('error', 'Unknown error')}"
+            )
+
+        # Test metrics calculation
+        if engine.fund_data is not None:
+            metrics = engine.calculate_pme_metrics()
+            if "Fund IRR" in metrics:
+                logger.info("   ✅ Metrics calculated")
             else:
-                errors.append(
-                    f"Fund data loading failed: {result.get('error', 'Unknown error')}"
-                )
-                logger.error(
-                    f"   ❌ Fund data loading failed: {result.get('error', 'Unknown error')}"
-                )
-
-            # Test metrics calculation
-            if engine.fund_data is not None:
-                metrics = engine.calculate_pme_metrics()
-                if "Fund IRR" in metrics:
-                    logger.info("   ✅ Metrics calculated")
-                else:
-                    errors.append("Metrics calculation returned incomplete results")
-                    logger.error(
-                        "   ❌ Metrics calculation returned incomplete results"
-                    )
-
-        finally:
-            # Cleanup
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+                errors.append("Metrics calculation returned incomplete results")
+                logger.error("   ❌ Metrics calculation returned incomplete results")
 
     except Exception as e:
         errors.append(f"Analysis engine test failed: {str(e)}")
@@ -186,21 +168,9 @@ def test_pme_engine():
     try:
         from pme_engine import BenchmarkType, PMEEngine
 
-        # Create test data
-        fund_data = pd.DataFrame(
-            {
-                "date": pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "cashflow": [-1000, -500, 0, 200, 300, 0, 400, 500],
-                "nav": [1000, 1400, 1450, 1350, 1600, 1700, 1600, 1800],
-            }
-        )
-
-        benchmark_data = pd.DataFrame(
-            {
-                "date": pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "price": [100, 105, 110, 108, 115, 120, 118, 125],
-            }
-        )
+        # Shared sample quarters
+        fund_data = sample_data.fund_frame()
+        benchmark_data = sample_data.benchmark_frame()
 
         # Test PME engine
         engine = PMEEngine(fund_data, benchmark_data, BenchmarkType.PRICE_ONLY)
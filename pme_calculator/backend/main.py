@@ -1,5 +1,10 @@
 """Main entry point for the PME Calculator FastAPI backend server."""
 
+import asyncio
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
@@ -9,12 +14,50 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from .logger import get_logger
+from .routers.upload import (
+    DATABASE_AVAILABLE,
+    META_QUEUE_SIZE,
+    flush_upload_meta,
+    reject_oversized_uploads,
+    sweep_expired_uploads,
+    uploaded_files,
+)
 from .routers.upload import router as upload_router
 from .simple_analysis import router as simple_analysis_router
 
+# uvloop is part of uvicorn[standard] but has no Windows build
+try:
+    import uvloop  # noqa: F401
+
+    EVENT_LOOP = "uvloop"
+except ImportError:
+    EVENT_LOOP = "asyncio"
+
 # Initialize logger
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Own the validation process pool, the upload registry sweeper and, when a
+    database is configured, the batched upload metadata writer.
+    """
+    app.state.validator_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    app.state.uploads = uploaded_files
+    background = [asyncio.create_task(sweep_expired_uploads())]
+    if DATABASE_AVAILABLE:
+        app.state.meta_queue = asyncio.Queue(META_QUEUE_SIZE)
+        background.append(asyncio.create_task(flush_upload_meta(app.state.meta_queue)))
+    yield
+    for task in background:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    app.state.uploads.drain()
+    app.state.validator_pool.shutdown(cancel_futures=True)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="PME Calculator API",
@@ -22,6 +65,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -38,6 +82,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Refuse oversized uploads from their headers, before the body is read
+app.middleware("http")(reject_oversized_uploads)
+
 # Include routers
 app.include_router(upload_router, prefix="/api")
 app.include_router(simple_analysis_router, prefix="/api")
@@ -151,7 +198,14 @@ def main():
     logger.debug("   • Professional error handling")
     logger.debug("=" * 60)
 
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        log_level="info",
+        loop=EVENT_LOOP,
+    )
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@
 Enhanced FastAPI server for PME Calculator with real analysis engine.
 """
 
+import asyncio
+import contextlib
+import errno
 import json
 import os
 import socket
@@ -14,9 +17,11 @@ from typing import Any
 
 import uvicorn
 from analysis_engine import PMEAnalysisEngine, make_json_serializable
-from fastapi import BackgroundTasks, FastAPI, File, HTTPException, UploadFile
+from cachetools import TTLCache
+from fastapi import BackgroundTasks, FastAPI, File, HTTPException, Request, UploadFile
 from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 # Database dependencies - make optional
 try:
@@ -77,6 +82,7 @@ except ImportError as e:
 # Import routes only if they exist and are working
 try:
     from routes.analysis import router as analysis_router
+    from routes.validation import reap_stale_jobs
     from routes.validation import router as validation_router
 
     ROUTES_AVAILABLE = True
@@ -147,8 +153,15 @@ async def lifespan(app: FastAPI):
     cleanup_old_temp_files()
     logger.info("Server startup complete. Old temp files cleaned.")
 
+    job_reaper = asyncio.create_task(reap_stale_jobs()) if ROUTES_AVAILABLE else None
+
     yield
 
+    if job_reaper is not None:
+        job_reaper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await job_reaper
+
     # Shutdown (if needed)
     logger.info("Server shutdown complete.")
 
@@ -203,8 +216,61 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Upload records are capped in number and age; evicting one removes its temp file
+UPLOAD_TTL = 3600
+MAX_UPLOADS = 256
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+MAX_UPLOAD_MB = 20
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+MULTIPART_SLACK = 64 * 1024  # form boundaries and part headers around each file
+
+# Largest request body accepted per upload route, by number of files it carries
+UPLOAD_BODY_LIMITS = {
+    "/api/upload/fund": MAX_UPLOAD_BYTES + MULTIPART_SLACK,
+    "/api/upload/index": MAX_UPLOAD_BYTES + MULTIPART_SLACK,
+    "/api/analysis/upload": 2 * (MAX_UPLOAD_BYTES + MULTIPART_SLACK),
+}
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Answer 413 from the Content-Length header before any upload body is read."""
+    limit = UPLOAD_BODY_LIMITS.get(request.url.path)
+    if limit is not None and request.method == "POST":
+        try:
+            content_length = int(request.headers.get("content-length", "0"))
+        except ValueError:
+            content_length = 0
+        if content_length > limit:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File too large. Maximum size: {MAX_UPLOAD_MB}MB"},
+            )
+    return await call_next(request)
+
+
+class UploadStore(TTLCache):
+    """LRU/TTL-bounded upload records that delete their temp file on eviction."""
+
+    @staticmethod
+    def _discard(info: dict[str, Any]) -> None:
+        if isinstance(info, dict) and info.get("path"):
+            Path(info["path"]).unlink(missing_ok=True)
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for _, info in expired:
+            self._discard(info)
+        return expired
+
+    def popitem(self):
+        file_id, info = super().popitem()
+        self._discard(info)
+        return file_id, info
+
+
 # In-memory storage for uploaded files - MUST be defined before router imports
-uploaded_files: dict[str, dict[str, Any]] = {}
+uploaded_files: UploadStore = UploadStore(maxsize=MAX_UPLOADS, ttl=UPLOAD_TTL)
 
 # Note: Enhanced analysis router removed to prevent circular import issues
 # The analysis functionality is already available through routes.analysis
@@ -514,12 +580,25 @@ async def upload_index_file(file: UploadFile = File(...)):
 
 async def save_temp_file(file: UploadFile) -> str:
     """Saves uploaded file to a temporary location and returns the path."""
-    with tempfile.NamedTemporaryFile(
-        delete=False, suffix=Path(file.filename).suffix
-    ) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        return tmp_file.name
+    dot = file.filename.rfind(".")
+    suffix = file.filename[dot:] if dot >= 0 else ""
+    fd, tmp_name = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            # Reserve the space up front so a full disk fails before any copying
+            if hasattr(os, "posix_fallocate") and file.size:
+                try:
+                    os.posix_fallocate(fd, 0, file.size)
+                except OSError as e:
+                    if e.errno == errno.ENOSPC:
+                        raise
+            # Copy in chunks so the whole upload is never held in memory
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp_file.write(chunk)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return tmp_name
 
 
 @app.get("/api/upload/files")
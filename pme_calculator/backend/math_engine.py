@@ -172,22 +172,27 @@ class MathEngine:
             return 0.0
 
     @staticmethod
-    def calculate_volatility(returns: list[float], annualize: bool = True) -> float:
+    def calculate_volatility(
+        returns: list[float] | np.ndarray, annualize: bool = True
+    ) -> float:
         """
         Calculate volatility (standard deviation of returns).
 
         Args:
-            returns: List of period returns
+            returns: List or array of period returns
             annualize: Whether to annualize the volatility
 
         Returns:
             Volatility as decimal
         """
         try:
-            if not returns or len(returns) < 2:
+            if returns is None:
+                return 0.0
+            values = np.asarray(returns, dtype=np.float64)
+            if values.size < 2:
                 return 0.0
 
-            volatility = np.std(returns, ddof=1)
+            volatility = values.std(ddof=1)
 
             if annualize:
                 # Assume monthly data, annualize with sqrt(12)
@@ -260,41 +265,41 @@ class MathEngine:
             return 0.0, 0, 0
 
     @staticmethod
-    def calculate_irr(cash_flows: list[float]) -> float:
+    def calculate_irr(cash_flows: list[float] | np.ndarray) -> float:
         """
         Calculate Internal Rate of Return.
 
         Args:
-            cash_flows: List of cash flows (negative for outflows, positive for inflows)
+            cash_flows: List or array of cash flows (negative for outflows, positive for inflows)
 
         Returns:
             IRR as decimal (e.g., 0.15 for 15%) or NaN for edge cases
         """
         try:
-            if not cash_flows or len(cash_flows) < 2:
+            if cash_flows is None or len(cash_flows) < 2:
                 raise ValueError("Need at least 2 cash flows for IRR calculation")
 
-            # Check if all cash flows are positive or all negative
-            positive_flows = sum(1 for cf in cash_flows if cf > 0)
-            negative_flows = sum(1 for cf in cash_flows if cf < 0)
+            flows = np.ascontiguousarray(cash_flows, dtype=np.float64)
 
-            if positive_flows == 0 or negative_flows == 0:
+            # Check if all cash flows are positive or all negative
+            if not (flows > 0).any() or not (flows < 0).any():
                 return np.nan  # No sign changes, no meaningful IRR
 
             # Use numpy financial function for IRR calculation
             try:
-                irr = npf.irr(cash_flows)
+                irr = npf.irr(flows)
                 if np.isnan(irr) or np.isinf(irr):
                     return np.nan
                 return float(irr)
             except:
                 # Fallback to scipy optimization
                 try:
-                    # NPV function for IRR calculation
+                    # NPV as a polynomial in the discount factor, evaluated by
+                    # Horner's rule
+                    coefficients = flows[::-1]
+
                     def npv(rate):
-                        return sum(
-                            cf / (1 + rate) ** i for i, cf in enumerate(cash_flows)
-                        )
+                        return np.polyval(coefficients, 1 / (1 + rate))
 
                     # Find rate where NPV = 0
                     result = brentq(npv, -0.99, 10.0)
@@ -12,6 +12,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from utils.time import utc_now_naive
 
 Base = declarative_base()
 
@@ -28,16 +29,19 @@ class Fund(Base):
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now_naive, onupdate=utc_now_naive
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
     # Relationships
     cash_flows: Mapped[list["CashFlow"]] = relationship(
-        "CashFlow", back_populates="fund", cascade="all, delete-orphan"
+        "CashFlow",
+        back_populates="fund",
+        cascade="all, delete-orphan",
+        order_by="CashFlow.date",
     )
     nav_entries: Mapped[list["NAV"]] = relationship(
-        "NAV", back_populates="fund", cascade="all, delete-orphan"
+        "NAV", back_populates="fund", cascade="all, delete-orphan", order_by="NAV.date"
     )
     portfolio_funds: Mapped[list["PortfolioFund"]] = relationship(
         "PortfolioFund", back_populates="fund"
@@ -58,7 +62,7 @@ class Portfolio(Base):
     risk_free_rate: Mapped[float] = mapped_column(Float, default=0.025)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utc_now_naive, onupdate=utc_now_naive
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
@@ -67,6 +71,8 @@ class Portfolio(Base):
         "PortfolioFund", back_populates="portfolio", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (Index("idx_portfolio_active_id", "is_active", "id"),)
+
 
 class PortfolioFund(Base):
     __tablename__ = "portfolio_funds"
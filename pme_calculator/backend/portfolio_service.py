@@ -3,9 +3,9 @@ import logging
 import numpy as np
 import pandas as pd
 from analysis_engine import PMEAnalysisEngine
-from models import NAV, CashFlow, Fund, Portfolio, PortfolioFund
+from models import Fund, Portfolio, PortfolioFund
 from scipy.optimize import minimize
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 # Import our central timezone utility
 from pme_calculator.utils.time import utc_now
@@ -21,21 +21,42 @@ class PortfolioService:
         self.analysis_engine = PMEAnalysisEngine()
 
     async def build_portfolio(
-        self, fund_ids: list[int], portfolio_name: str = "New Portfolio"
+        self,
+        fund_ids: list[int],
+        portfolio_name: str = "New Portfolio",
+        description: str | None = None,
+        benchmark_symbol: str | None = None,
+        risk_free_rate: float | None = None,
     ) -> Portfolio:
-        """Build a new portfolio from fund IDs."""
+        """
+        Build a new portfolio from fund IDs.
+
+        Rows are flushed but not committed, so the caller can commit the
+        portfolio and its funds in one transaction.
+        """
         try:
-            # Create new portfolio
-            portfolio = Portfolio(name=portfolio_name)
+            # Create new portfolio; unset settings fall back to column defaults
+            details = {
+                "description": description,
+                "benchmark_symbol": benchmark_symbol,
+                "risk_free_rate": risk_free_rate,
+            }
+            portfolio = Portfolio(
+                name=portfolio_name,
+                **{key: value for key, value in details.items() if value is not None},
+            )
             self.db.add(portfolio)
             self.db.flush()  # Get portfolio ID
 
             # Add funds to portfolio with equal weights initially
             weight = 1.0 / len(fund_ids) if fund_ids else 0.0
 
+            existing = {
+                fund_id
+                for (fund_id,) in self.db.query(Fund.id).filter(Fund.id.in_(fund_ids))
+            }
             for fund_id in fund_ids:
-                fund = self.db.query(Fund).filter(Fund.id == fund_id).first()
-                if not fund:
+                if fund_id not in existing:
                     logger.warning(f"Fund {fund_id} not found")
                     continue
 
@@ -44,9 +65,9 @@ class PortfolioService:
                 )
                 self.db.add(portfolio_fund)
 
-            self.db.commit()
+            self.db.flush()
             logger.info(
-                f"Created portfolio '{portfolio_name}' with {len(fund_ids)} funds"
+                f"Built portfolio '{portfolio_name}' with {len(fund_ids)} funds"
             )
             return portfolio
 
@@ -58,16 +79,21 @@ class PortfolioService:
     async def calc_portfolio_kpis(self, portfolio_id: int) -> dict:
         """Calculate comprehensive portfolio KPIs including Markowitz optimal weights."""
         try:
-            portfolio = (
-                self.db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
-            )
+            # Primary-key lookup; free when the caller already loaded it
+            portfolio = self.db.get(Portfolio, portfolio_id)
             if not portfolio:
                 raise ValueError(f"Portfolio {portfolio_id} not found")
 
-            # Get portfolio funds with current weights
+            # Get portfolio funds with current weights; each fund's cash flows
+            # and NAVs come from one IN query per table rather than per fund
+            fund = selectinload(PortfolioFund.fund)
             portfolio_funds = (
                 self.db.query(PortfolioFund)
                 .filter(PortfolioFund.portfolio_id == portfolio_id)
+                .options(
+                    fund.selectinload(Fund.cash_flows),
+                    fund.selectinload(Fund.nav_entries),
+                )
                 .all()
             )
 
@@ -80,7 +106,7 @@ class PortfolioService:
             fund_weights = []
 
             for pf in portfolio_funds:
-                fund_data = await self._get_fund_data(pf.fund_id)
+                fund_data = self._fund_data(pf.fund) if pf.fund else None
                 if fund_data:
                     metrics = self.analysis_engine.calculate_metrics(
                         fund_data["cash_flows"], fund_data["nav_data"]
@@ -388,39 +414,31 @@ class PortfolioService:
     async def _get_fund_data(self, fund_id: int) -> dict | None:
         """Get cash flow and NAV data for a fund."""
         try:
-            fund = self.db.query(Fund).filter(Fund.id == fund_id).first()
-            if not fund:
-                return None
-
-            # Get cash flows
-            cash_flows = []
-            cf_entries = (
-                self.db.query(CashFlow)
-                .filter(CashFlow.fund_id == fund_id)
-                .order_by(CashFlow.date)
-                .all()
+            fund = (
+                self.db.query(Fund)
+                .filter(Fund.id == fund_id)
+                .options(selectinload(Fund.cash_flows), selectinload(Fund.nav_entries))
+                .first()
             )
-            for cf in cf_entries:
-                cash_flows.append({"date": cf.date, "amount": cf.amount})
-
-            # Get NAV data
-            nav_data = []
-            nav_entries = (
-                self.db.query(NAV)
-                .filter(NAV.fund_id == fund_id)
-                .order_by(NAV.date)
-                .all()
-            )
-            for nav in nav_entries:
-                nav_data.append({"date": nav.date, "nav": nav.nav_value})
+        except Exception as e:
+            logger.error(f"Error getting fund data for {fund_id}: {str(e)}")
+            return None
+        return self._fund_data(fund) if fund else None
 
+    def _fund_data(self, fund: Fund) -> dict | None:
+        """Cash flow and NAV series of an already loaded fund, in date order."""
+        try:
             return {
-                "fund_id": fund_id,
+                "fund_id": fund.id,
                 "fund_name": fund.name,
-                "cash_flows": cash_flows,
-                "nav_data": nav_data,
+                "cash_flows": [
+                    {"date": cf.date, "amount": cf.amount} for cf in fund.cash_flows
+                ],
+                "nav_data": [
+                    {"date": nav.date, "nav": nav.nav_value} for nav in fund.nav_entries
+                ],
             }
 
         except Exception as e:
-            logger.error(f"Error getting fund data for {fund_id}: {str(e)}")
+            logger.error(f"Error getting fund data for {fund.id}: {str(e)}")
             return None
@@ -1,11 +1,13 @@
 import io
 import logging
 from datetime import datetime
+from typing import BinaryIO
 
 import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 from jinja2 import Template
+from openpyxl import Workbook
 from weasyprint import CSS, HTML
 
 matplotlib.use("Agg")  # Use non-interactive backend
@@ -29,14 +31,18 @@ class ReportingService:
 
     async def generate_pdf(self, portfolio_id: int) -> bytes:
         """Generate branded PDF report for portfolio."""
-        try:
-            # Get portfolio data
-            portfolio = (
-                self.db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
-            )
-            if not portfolio:
-                raise ValueError(f"Portfolio {portfolio_id} not found")
+        buffer = io.BytesIO()
+        await self.write_pdf(self._get_portfolio(portfolio_id), buffer)
+        return buffer.getvalue()
+
+    async def write_pdf(self, portfolio: Portfolio, target: BinaryIO) -> None:
+        """Render the PDF report straight into ``target``.
 
+        Every step blocks (queries, charts, layout); servers run the whole
+        coroutine in a worker thread.
+        """
+        portfolio_id = portfolio.id
+        try:
             # Get portfolio analytics
             analytics = await self.portfolio_service.calc_portfolio_kpis(portfolio_id)
 
@@ -46,13 +52,11 @@ class ReportingService:
             # Render HTML template
             html_content = self._render_pdf_template(portfolio, analytics, charts)
 
-            # Generate PDF
-            pdf_bytes = HTML(string=html_content).write_pdf(
-                stylesheets=[CSS(string=self._get_pdf_styles())]
+            HTML(string=html_content).write_pdf(
+                target=target, stylesheets=[CSS(string=self._get_pdf_styles())]
             )
 
             logger.info(f"Generated PDF report for portfolio {portfolio_id}")
-            return pdf_bytes
 
         except Exception as e:
             logger.error(f"Error generating PDF: {str(e)}")
@@ -60,44 +64,53 @@ class ReportingService:
 
     async def generate_excel(self, portfolio_id: int) -> bytes:
         """Generate Excel workbook with multiple sheets."""
-        try:
-            portfolio = (
-                self.db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
-            )
-            if not portfolio:
-                raise ValueError(f"Portfolio {portfolio_id} not found")
+        buffer = io.BytesIO()
+        await self.write_excel(self._get_portfolio(portfolio_id), buffer)
+        return buffer.getvalue()
 
-            # Create Excel writer
-            buffer = io.BytesIO()
+    async def write_excel(self, portfolio: Portfolio, target: BinaryIO) -> None:
+        """Write the Excel report into ``target`` using a write-only workbook.
 
-            with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        Blocking like ``write_pdf``; servers run it in a worker thread.
+        """
+        portfolio_id = portfolio.id
+        try:
+            # Write-only sheets flush rows as they are appended instead of
+            # keeping a cell object per value
+            workbook = Workbook(write_only=True)
+            analytics = await self.portfolio_service.calc_portfolio_kpis(portfolio_id)
 
-                # Summary sheet
-                await self._write_summary_sheet(writer, portfolio_id)
+            # Summary sheet
+            self._write_summary_sheet(workbook, analytics)
 
-                # Individual fund sheets
-                portfolio_funds = (
-                    self.db.query(PortfolioFund)
-                    .filter(PortfolioFund.portfolio_id == portfolio_id)
-                    .all()
-                )
+            # Individual fund sheets
+            portfolio_funds = (
+                self.db.query(PortfolioFund)
+                .filter(PortfolioFund.portfolio_id == portfolio_id)
+                .all()
+            )
 
-                for pf in portfolio_funds:
-                    await self._write_fund_sheet(writer, pf.fund_id, pf.fund.name)
+            for pf in portfolio_funds:
+                await self._write_fund_sheet(workbook, pf.fund_id, pf.fund.name)
 
-                # Analytics sheet
-                await self._write_analytics_sheet(writer, portfolio_id)
+            # Analytics sheet
+            self._write_analytics_sheet(workbook, analytics)
 
-            buffer.seek(0)
-            excel_bytes = buffer.getvalue()
+            workbook.save(target)
 
             logger.info(f"Generated Excel report for portfolio {portfolio_id}")
-            return excel_bytes
 
         except Exception as e:
             logger.error(f"Error generating Excel: {str(e)}")
             raise
 
+    def _get_portfolio(self, portfolio_id: int) -> Portfolio:
+        """Primary-key lookup that reuses the session's identity map."""
+        portfolio = self.db.get(Portfolio, portfolio_id)
+        if not portfolio:
+            raise ValueError(f"Portfolio {portfolio_id} not found")
+        return portfolio
+
     def _render_pdf_template(
         self, portfolio: Portfolio, analytics: dict, charts: dict
     ) -> str:
@@ -306,11 +319,23 @@ class ReportingService:
 
         return charts
 
-    async def _write_summary_sheet(self, writer: pd.ExcelWriter, portfolio_id: int):
+    @staticmethod
+    def _append_sheet(
+        workbook: Workbook, title: str, df: pd.DataFrame, index: bool = False
+    ) -> None:
+        """Append ``df`` as a new sheet, header row first, as to_excel lays it out."""
+        if index:
+            df = df.reset_index(names="")
+        # Missing values become empty cells, as to_excel wrote them
+        df = df.astype(object).where(df.notna(), None)
+        sheet = workbook.create_sheet(title=title)
+        sheet.append(list(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            sheet.append(row)
+
+    def _write_summary_sheet(self, workbook: Workbook, analytics: dict):
         """Write portfolio summary sheet to Excel."""
         try:
-            analytics = await self.portfolio_service.calc_portfolio_kpis(portfolio_id)
-
             # Create summary DataFrame
             summary_data = []
 
@@ -332,14 +357,12 @@ class ReportingService:
 
             # Create DataFrame
             df = pd.DataFrame(summary_data, columns=["Category", "Metric", "Value"])
-            df.to_excel(writer, sheet_name="Portfolio Summary", index=False)
+            self._append_sheet(workbook, "Portfolio Summary", df)
 
         except Exception as e:
             logger.error(f"Error writing summary sheet: {str(e)}")
 
-    async def _write_fund_sheet(
-        self, writer: pd.ExcelWriter, fund_id: int, fund_name: str
-    ):
+    async def _write_fund_sheet(self, workbook: Workbook, fund_id: int, fund_name: str):
         """Write individual fund sheet to Excel."""
         try:
             fund_data = await self.portfolio_service._get_fund_data(fund_id)
@@ -360,16 +383,14 @@ class ReportingService:
             if cf_data:
                 cf_df = pd.DataFrame(cf_data)
                 sheet_name = f"{fund_name[:25]}_CashFlows"  # Excel sheet name limit
-                cf_df.to_excel(writer, sheet_name=sheet_name, index=False)
+                self._append_sheet(workbook, sheet_name, cf_df)
 
         except Exception as e:
             logger.error(f"Error writing fund sheet for {fund_name}: {str(e)}")
 
-    async def _write_analytics_sheet(self, writer: pd.ExcelWriter, portfolio_id: int):
+    def _write_analytics_sheet(self, workbook: Workbook, analytics: dict):
         """Write analytics sheet with correlation matrix and weights."""
         try:
-            analytics = await self.portfolio_service.calc_portfolio_kpis(portfolio_id)
-
             # Correlation matrix
             if analytics.get("correlation_matrix"):
                 corr_df = pd.DataFrame(
@@ -383,7 +404,7 @@ class ReportingService:
                         for i in range(len(analytics["correlation_matrix"]))
                     ],
                 )
-                corr_df.to_excel(writer, sheet_name="Correlations")
+                self._append_sheet(workbook, "Correlations", corr_df, index=True)
 
             # Weights comparison
             if analytics.get("optimal_weights", {}).get("optimization_success"):
@@ -404,7 +425,7 @@ class ReportingService:
                     )
 
                 weights_df = pd.DataFrame(weights_data)
-                weights_df.to_excel(writer, sheet_name="Weight_Analysis", index=False)
+                self._append_sheet(workbook, "Weight_Analysis", weights_df)
 
         except Exception as e:
             logger.error(f"Error writing analytics sheet: {str(e)}")
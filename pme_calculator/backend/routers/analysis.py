@@ -3,6 +3,7 @@ Enhanced Analysis Router with Charting Integration
 Provides comprehensive PME analysis with interactive visualizations.
 """
 
+import asyncio
 import contextlib
 import io
 import json
@@ -10,10 +11,13 @@ import os
 import tempfile
 import time
 import uuid
+from collections.abc import Iterator
 from datetime import datetime
+from queue import SimpleQueue
 from typing import Any
 
 import numpy as np
+import orjson
 import pandas as pd
 from analysis_engine import PMEAnalysisEngine
 from chart_engine import ChartEngine
@@ -42,16 +46,52 @@ from validation.schemas_simple import (
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1/analysis", tags=["analysis"])
 
+# Accepted upload file extensions
+UPLOAD_EXTENSIONS = (".csv", ".xlsx", ".xls")
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+
 # In-memory cache for analysis results (replace with Redis in production)
 analysis_cache: dict[str, dict[str, Any]] = {}
 
 # Global data processor instance
 data_processor = IntelligentDataProcessor()
 
+# Pool of analysis engines so concurrent requests never share engine state
+_engine_pool: SimpleQueue[PMEAnalysisEngine] = SimpleQueue()
+for _ in range(os.cpu_count() or 4):
+    _engine_pool.put(PMEAnalysisEngine())
+
 # Global instances
-analysis_engine = PMEAnalysisEngine()
 chart_engine = ChartEngine()
 
+
+@contextlib.contextmanager
+def _pooled_engine() -> Iterator[PMEAnalysisEngine]:
+    """
+    Borrow a clean analysis engine from the pool for the duration of a block.
+    Waits for a free engine, so only call it from worker threads.
+    """
+    engine = _engine_pool.get()
+    engine.fund_data = None
+    engine.index_data = None
+    try:
+        yield engine
+    finally:
+        _engine_pool.put(engine)
+
+
+def _load_fund_file(path: str) -> tuple[dict[str, Any], pd.DataFrame | None]:
+    """Load a fund file on a pooled engine; returns the result and loaded frame."""
+    with _pooled_engine() as engine:
+        return engine.load_fund_data(path), engine.fund_data
+
+
+def _load_benchmark_file(path: str) -> dict[str, Any]:
+    """Load a benchmark file on a pooled engine."""
+    with _pooled_engine() as engine:
+        return engine.load_benchmark_data(path)
+
+
 # Global reference to uploaded files - will be set by main_minimal.py
 uploaded_files: dict[str, dict[str, Any]] = {}
 
@@ -499,7 +539,7 @@ async def process_datasets(
             # Determine file type and read data
             if file.filename.endswith(".csv"):
                 df = pd.read_csv(io.StringIO(content.decode("utf-8")))
-            elif file.filename.endswith((".xlsx", ".xls")):
+            elif file.filename.endswith(EXCEL_EXTENSIONS):
                 df = pd.read_excel(io.BytesIO(content))
             else:
                 continue
@@ -648,7 +688,7 @@ async def apply_data_fix(
             # Determine file type and read data
             if file.filename.endswith(".csv"):
                 df = pd.read_csv(io.StringIO(content.decode("utf-8")))
-            elif file.filename.endswith((".xlsx", ".xls")):
+            elif file.filename.endswith(EXCEL_EXTENSIONS):
                 df = pd.read_excel(io.BytesIO(content))
             else:
                 continue
@@ -786,7 +826,7 @@ async def upload_fund_data(
         raise HTTPException(status_code=400, detail="No file provided")
 
     # Validate file type
-    if not file.filename.endswith((".csv", ".xlsx", ".xls")):
+    if not file.filename.endswith(UPLOAD_EXTENSIONS):
         raise HTTPException(
             status_code=400,
             detail="Invalid file format. Please upload CSV or Excel files.",
@@ -802,7 +842,7 @@ async def upload_fund_data(
             temp_path = tmp_file.name
 
         # Load and validate data
-        result = analysis_engine.load_fund_data(temp_path)
+        result, _ = await run_in_threadpool(_load_fund_file, temp_path)
 
         if result["success"]:
             # Add metadata
@@ -849,7 +889,7 @@ async def upload_benchmark_data(
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
 
-    if not file.filename.endswith((".csv", ".xlsx", ".xls")):
+    if not file.filename.endswith(UPLOAD_EXTENSIONS):
         raise HTTPException(
             status_code=400,
             detail="Invalid file format. Please upload CSV or Excel files.",
@@ -865,7 +905,7 @@ async def upload_benchmark_data(
             temp_path = tmp_file.name
 
         # Load and validate benchmark data
-        result = analysis_engine.load_benchmark_data(temp_path)
+        result = await run_in_threadpool(_load_benchmark_file, temp_path)
 
         if result["success"]:
             result["metadata"] = {
@@ -1097,38 +1137,25 @@ async def calculate_scenario_analysis(
 
     try:
         # Parse scenarios
-        scenario_data = json.loads(scenarios)
+        scenario_data = orjson.loads(scenarios)
 
         fund_path = f"/tmp/{fund_file_id}"
         if not os.path.exists(fund_path):
             raise HTTPException(status_code=404, detail="Fund data file not found")
 
         # Load fund data
-        fund_result = analysis_engine.load_fund_data(fund_path)
+        fund_result, fund_data = await run_in_threadpool(_load_fund_file, fund_path)
         if not fund_result["success"]:
             raise HTTPException(status_code=400, detail="Failed to load fund data")
 
-        fund_data = fund_result["data"]
-
-        # Run scenarios
-        scenario_results = {}
-
-        for scenario_name, scenario_params in scenario_data.items():
-            # Modify fund data based on scenario
-            modified_data = _apply_scenario(fund_data.copy(), scenario_params)
-
-            # Calculate metrics for scenario
-            scenario_analysis = PMEAnalysisEngine()
-            scenario_analysis.fund_data = modified_data
-
-            scenario_metrics = scenario_analysis.calculate_pme_metrics()
-            scenario_results[scenario_name] = {
-                "metrics": (
-                    scenario_metrics["metrics"] if scenario_metrics["success"] else {}
-                ),
-                "parameters": scenario_params,
-                "success": scenario_metrics["success"],
-            }
+        # Run scenarios concurrently, each on its own pooled engine
+        outcomes = await asyncio.gather(
+            *(
+                run_in_threadpool(_run_one_scenario, fund_data, scenario_params)
+                for scenario_params in scenario_data.values()
+            )
+        )
+        scenario_results = dict(zip(scenario_data, outcomes, strict=True))
 
         return JSONResponse(
             content={
@@ -1139,7 +1166,7 @@ async def calculate_scenario_analysis(
             }
         )
 
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, orjson.JSONDecodeError):
         raise HTTPException(status_code=400, detail="Invalid scenarios JSON format")
     except Exception as e:
         logger.error(f"Scenario analysis failed: {e}")
@@ -1188,6 +1215,24 @@ def _generate_analysis_summary(metrics: dict[str, Any]) -> dict[str, str]:
     return summary
 
 
+def _run_one_scenario(
+    fund_data: pd.DataFrame, scenario_params: dict[str, Any]
+) -> dict[str, Any]:
+    """Calculate metrics for a single scenario on a pooled engine."""
+
+    modified_data = _apply_scenario(fund_data, scenario_params)
+
+    with _pooled_engine() as engine:
+        engine.fund_data = modified_data
+        scenario_metrics = engine.calculate_pme_metrics()
+
+    return {
+        "metrics": scenario_metrics["metrics"] if scenario_metrics["success"] else {},
+        "parameters": scenario_params,
+        "success": scenario_metrics["success"],
+    }
+
+
 def _apply_scenario(
     fund_data: pd.DataFrame, scenario_params: dict[str, Any]
 ) -> pd.DataFrame:
@@ -1,32 +1,51 @@
 """
 FastAPI upload router with comprehensive file validation.
+
+The upload handlers are ``async def`` and expect to run on the uvloop event
+loop that ``main.main`` selects when uvloop is installed (plain asyncio
+otherwise). They only await ``UploadFile.read`` and executor hops; disk
+writes and validation never run on the loop thread itself.
 """
 
+import asyncio
+import errno
+import hashlib
+import logging
+import os
 import tempfile
+import time
 import uuid
 from pathlib import Path
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Iterable, Literal
 
-import aiofiles
+from anyio import CapacityLimiter, to_thread
+from cache import cache_delete, cache_get, cache_set
+from cachetools import TTLCache
 from fastapi import (
     APIRouter,
     BackgroundTasks,
     File,
     HTTPException,
     Query,
+    Request,
     UploadFile,
 )
-from fastapi.responses import JSONResponse as _JSONResponse  # noqa: F401
+from fastapi.responses import JSONResponse as _JSONResponse
+from fastapi.responses import ORJSONResponse
 from logger import get_logger
-from utils.time import utc_now
-from validation.file_check_simple import validate_file_comprehensive
+from utils.time import iso_now, utc_now
+from validation.file_check_simple import (
+    validate_csv_header,
+    validate_file_comprehensive,
+)
 from validation.schemas_simple import (
     UploadResponse,
+    ValidationResult,
 )
 
 # Make database imports optional
 try:
-    from database import get_session
+    from database import async_session, create_upload_records, get_session
     from models.upload_meta import UploadFileMeta
 
     DATABASE_AVAILABLE = True
@@ -42,268 +61,436 @@ except ImportError as e:
 
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/v1/uploads", tags=["upload"])
+router = APIRouter(
+    prefix="/v1/uploads", tags=["upload"], default_response_class=ORJSONResponse
+)
+UPLOAD_PATH = f"/api{router.prefix}"
 
 # File validation constants
 MAX_MB = 20
-ALLOWED = {
-    "text/csv",
-    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+MAX_BYTES = MAX_MB * 1024 * 1024
+
+# Accepted (content type, extension) pairs and the parser kind they map to
+UPLOAD_DISPATCH = {
+    ("text/csv", ".csv"): "csv",
+    (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        ".xlsx",
+    ): "xlsx",
+    ("application/vnd.ms-excel", ".xls"): "xls",
 }
+ALLOWED_STR = ", ".join(f"{ext} ({ctype})" for ctype, ext in UPLOAD_DISPATCH)
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+WRITE_BATCH = 8  # chunks handed to the writer thread per hop
+BUFFER_POOL_SIZE = 16  # idle chunk buffers kept for reuse across uploads
+HAS_WRITEV = hasattr(os, "writev")  # not available on Windows
+HAS_FALLOCATE = hasattr(os, "posix_fallocate")  # Linux/BSD only
+HEADER_SNIFF_BYTES = 64 * 1024  # CSV header must end within this prefix
+MULTIPART_SLACK = 64 * 1024  # form boundaries and part headers around the file
+
+# Uploads are written under a dedicated directory, tmpfs-backed where available
+UPLOAD_DIR = Path(
+    os.environ.get("PME_UPLOAD_DIR")
+    or Path("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+    / "pme_uploads"
+)
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+O_BINARY = getattr(os, "O_BINARY", 0)  # Windows only
+
+# Uploads stay available for an hour; the sweeper evicts expired records
+UPLOAD_TTL = 3600
+UPLOAD_REGISTRY_SIZE = 10_000
+UPLOAD_SWEEP_INTERVAL = 60
+UPLOAD_KEY_PREFIX = "pme:upload:"
+
+# Upload metadata rows are written to the database in batches
+META_QUEUE_SIZE = 1024
+META_BATCH_SIZE = 64
+META_FLUSH_INTERVAL = 0.1
+
+# Caps concurrent validations when no process pool is configured
+_VALIDATOR_LIMIT = CapacityLimiter(min(4, os.cpu_count() or 2))
+
+# Random bytes for upload ids are drawn from one urandom call at a time
+_RAND_POOL_SIZE = 4096
+_rand_pool = b""
+_rand_pos = 0
+
+
+def _uuid7() -> uuid.UUID:
+    """Time-ordered UUIDv7 (RFC 9562) with 74 random bits from a pooled buffer."""
+    global _rand_pool, _rand_pos
+    if _rand_pos + 10 > len(_rand_pool):
+        _rand_pool = os.urandom(_RAND_POOL_SIZE)
+        _rand_pos = 0
+    rand = int.from_bytes(_rand_pool[_rand_pos : _rand_pos + 10], "big")
+    _rand_pos += 10
+    unix_ms = time.time_ns() // 1_000_000
+    return uuid.UUID(
+        int=(unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | (rand >> 68) << 64  # rand_a, 12 bits
+        | 0b10 << 62  # variant
+        | rand & ((1 << 62) - 1)  # rand_b, 62 bits
+    )
 
-# In-memory storage for uploaded files (replace with Redis/DB in production)
-uploaded_files: dict[str, dict[str, Any]] = {}
 
+# The stdlib generator (Python 3.14+) also keeps ids monotonic within a millisecond
+new_upload_id = getattr(uuid, "uuid7", _uuid7)
 
-# UploadResponse now imported from schemas_simple
+# Free list of CHUNK_SIZE read buffers shared by uploads on the event loop
+_buffer_pool: list[bytearray] = []
 
+# Keeps eviction cleanup tasks alive until they finish
+_cleanup_tasks: set[asyncio.Task] = set()
 
-@router.post("/fund", response_model=UploadResponse)
-async def upload_fund_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(..., description="Fund cashflow file (CSV/Excel)"),
-) -> UploadResponse:
-    """
-    Upload and validate fund cashflow file.
-    Returns validation results and file ID for subsequent analysis.
-    """
-    file_id = str(uuid.uuid4())
-
-    logger.info(
-        "Upload request started",
-        extra={
-            "file_id": file_id,
-            "filename": file.filename,
-            "content_type": file.content_type,
-            "file_size": file.size if hasattr(file, "size") else "unknown",
-        },
-    )
 
-    # Basic file checks
-    if not file.filename:
-        raise HTTPException(400, detail="No filename provided")
+def _discard_uploads(records: list[dict[str, Any]]) -> None:
+    """Remove evicted uploads' temp files, as one background task when possible."""
+    paths = [file_data["temp_path"] for file_data in records]
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _unlink_temp_files(paths)
+        return
+    task = loop.create_task(cleanup_temp_files(paths))
+    _cleanup_tasks.add(task)
+    task.add_done_callback(_cleanup_tasks.discard)
 
-    # Content type validation
-    if file.content_type not in ALLOWED:
-        raise HTTPException(
-            415, detail=f"Unsupported media type. Allowed: {', '.join(ALLOWED)}"
-        )
 
-    # File size validation
-    if hasattr(file, "size") and file.size is not None and file.size > MAX_MB * 1024**2:
-        raise HTTPException(413, detail=f"File too large. Maximum size: {MAX_MB}MB")
+class UploadRegistry(TTLCache):
+    """
+    Size- and TTL-bounded upload records.
+    Temp files are removed whenever a record is evicted.
+    """
 
-    allowed_extensions = {".csv", ".xlsx", ".xls"}
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            400,
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}",
-        )
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Ids of fund uploads, kept in step with the records so finding one
+        # does not scan every upload
+        self.fund_ids: set[str] = set()
 
-    # Create temporary file
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            tmp_path = Path(tmp_file.name)
+    def __setitem__(self, file_id, file_data):
+        super().__setitem__(file_id, file_data)
+        if file_data.get("file_type") == "fund":
+            self.fund_ids.add(file_id)
+        else:
+            self.fund_ids.discard(file_id)
 
-        # Read and save uploaded content asynchronously
-        content = await file.read()
+    def __delitem__(self, file_id):
+        super().__delitem__(file_id)
+        self.fund_ids.discard(file_id)
 
-        # Check file size if not available from file object
-        if len(content) > MAX_MB * 1024**2:
-            raise HTTPException(413, detail=f"File too large. Maximum size: {MAX_MB}MB")
+    def clear(self):
+        super().clear()
+        self.fund_ids.clear()
 
-        async with aiofiles.open(tmp_path, "wb") as f:
-            await f.write(content)
+    def expire(self, time=None):
+        expired = super().expire(time)
+        if expired:
+            self.fund_ids.difference_update(file_id for file_id, _ in expired)
+            _discard_uploads([file_data for _, file_data in expired])
+        return expired
 
-        logger.info(
-            "File saved to temporary location",
-            extra={
-                "file_id": file_id,
-                "temp_path": str(tmp_path),
-                "file_size": len(content),
-            },
-        )
+    def popitem(self):
+        file_id, file_data = super().popitem()
+        _discard_uploads([file_data])
+        return file_id, file_data
 
-        # Validate file
-        validation_result = validate_file_comprehensive(tmp_path, "fund")
+    def drain(self) -> None:
+        """Drop every record and delete its temp file, e.g. on shutdown."""
+        _unlink_temp_files([file_data["temp_path"] for file_data in self.values()])
+        self.clear()
 
-        if validation_result.is_valid:
-            # Store file info for later analysis
-            uploaded_files[file_id] = {
-                "filename": file.filename,
-                "temp_path": str(tmp_path),
-                "file_type": "fund",
-                "validation": validation_result,
-                "upload_timestamp": utc_now().isoformat(),
-            }
 
-            # Insert UploadFileMeta row if database is available
-            upload_meta = None
-            if DATABASE_AVAILABLE and UploadFileMeta:
-                # Skip database operations for now - running in memory mode
-                pass
+# Per-process view of uploaded files; records are mirrored to the shared
+# Redis cache so any worker can resolve a file_id
+uploaded_files = UploadRegistry(maxsize=UPLOAD_REGISTRY_SIZE, ttl=UPLOAD_TTL)
 
-            logger.info(
-                "Fund file validated successfully",
-                extra={
-                    "file_id": file_id,
-                    "upload_id": getattr(upload_meta, "id", None),
-                    "row_count": (
-                        validation_result.metadata.row_count
-                        if validation_result.metadata
-                        else None
-                    ),
-                    "detected_columns": validation_result.detected_mappings,
-                },
-            )
+# Validation results keyed by "<file_type>:<sha256>", oldest evicted first
+validation_cache: dict[str, ValidationResult] = {}
+VALIDATION_CACHE_SIZE = 256
 
-            message = f"Fund file uploaded and validated successfully. {validation_result.metadata.row_count if validation_result.metadata else 'Unknown'} rows detected."
 
-        else:
-            # Clean up temp file on validation failure
-            background_tasks.add_task(cleanup_temp_file, tmp_path)
+# UploadResponse now imported from schemas_simple
 
-            logger.warning(
-                "Fund file validation failed",
-                extra={
-                    "file_id": file_id,
-                    "errors": validation_result.errors,
-                    "warnings": validation_result.warnings,
-                },
-            )
 
-            message = (
-                f"File validation failed with {len(validation_result.errors)} errors."
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    HTTP middleware answering 413 from the Content-Length header alone, before
+    any upload body is received. Chunked bodies are still capped while streaming.
+    """
+    if request.method == "POST" and request.url.path.startswith(UPLOAD_PATH):
+        try:
+            content_length = int(request.headers.get("content-length", "0"))
+        except ValueError:
+            content_length = 0
+        if content_length > MAX_BYTES + MULTIPART_SLACK:
+            return _JSONResponse(
+                status_code=413,
+                content={"detail": f"File too large. Maximum size: {MAX_MB}MB"},
             )
+    return await call_next(request)
 
-        return UploadResponse(
-            success=validation_result.is_valid,
-            file_id=file_id,
-            filename=file.filename,
-            validation=validation_result,
-            message=message,
-        )
 
-    except Exception as e:
-        logger.error(
-            "Upload processing failed", extra={"file_id": file_id, "error": str(e)}
-        )
+def _jsonable_record(file_data: dict[str, Any]) -> dict[str, Any]:
+    """Upload record with its ValidationResult dumped to plain JSON types."""
+    validation = file_data["validation"]
+    if isinstance(validation, ValidationResult):
+        return {**file_data, "validation": validation.model_dump(mode="json")}
+    return file_data
 
-        # Clean up temp file on error
-        if "tmp_path" in locals():
-            background_tasks.add_task(cleanup_temp_file, tmp_path)
 
-        raise HTTPException(500, detail=f"File processing failed: {str(e)}")
+async def _publish_upload(file_id: str, file_data: dict[str, Any]) -> None:
+    """Record an upload locally and in the shared cache."""
+    uploaded_files[file_id] = file_data
+    await cache_set(
+        f"{UPLOAD_KEY_PREFIX}{file_id}", _jsonable_record(file_data), ttl=UPLOAD_TTL
+    )
 
 
-@router.post("/index", response_model=UploadResponse)
-async def upload_index_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(..., description="Index price file (CSV/Excel)"),
-) -> UploadResponse:
-    """
-    Upload and validate index price file.
-    Returns validation results and file ID for subsequent analysis.
-    """
-    file_id = str(uuid.uuid4())
-
-    logger.info(
-        "Index upload request started",
-        extra={
-            "file_id": file_id,
-            "filename": file.filename,
-            "content_type": file.content_type,
-        },
+async def _lookup_upload(file_id: str) -> dict[str, Any] | None:
+    """Find an upload record, falling back to the shared cache on a local miss."""
+    if file_id in uploaded_files:
+        return uploaded_files[file_id]
+    return await cache_get(f"{UPLOAD_KEY_PREFIX}{file_id}")
+
+
+def _writev_all(fd: int, buffers: list[bytes]) -> None:
+    """Write every buffer to ``fd`` with vectored writes, resuming after short writes."""
+    views = [memoryview(buf) for buf in buffers]
+    while views:
+        written = os.writev(fd, views) if HAS_WRITEV else os.write(fd, views[0])
+        while views and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if written:
+            views[0] = views[0][written:]
+
+
+def _acquire_buffer() -> bytearray:
+    """Take a chunk buffer from the free list, allocating one if it is empty."""
+    return _buffer_pool.pop() if _buffer_pool else bytearray(CHUNK_SIZE)
+
+
+def _release_buffers(buffers: list[bytearray]) -> None:
+    """Return chunk buffers to the free list, dropping any beyond its cap."""
+    for buf in buffers:
+        if len(_buffer_pool) < BUFFER_POOL_SIZE:
+            _buffer_pool.append(buf)
+
+
+def _stamp_validation(
+    result: ValidationResult, tmp_path: Path, file_size: int
+) -> ValidationResult:
+    """Private copy of a cached, content-level result carrying this upload's metadata."""
+    if result.metadata is None:
+        return result.model_copy(deep=True)
+    metadata = result.metadata.model_copy(
+        update={
+            "filename": tmp_path.name,
+            "file_size": file_size,
+            "upload_timestamp": utc_now(),
+        }
     )
+    return result.model_copy(deep=True, update={"metadata": metadata})
 
-    # Basic file checks
-    if not file.filename:
-        raise HTTPException(400, detail="No filename provided")
 
-    # Content type validation
-    if file.content_type not in ALLOWED:
-        raise HTTPException(
-            415, detail=f"Unsupported media type. Allowed: {', '.join(ALLOWED)}"
-        )
+class _CsvHeaderError(Exception):
+    """A CSV header lacking required columns, caught before the body is written."""
 
-    # File size validation
-    if hasattr(file, "size") and file.size is not None and file.size > MAX_MB * 1024**2:
-        raise HTTPException(413, detail=f"File too large. Maximum size: {MAX_MB}MB")
+    def __init__(self, errors: list[str]):
+        super().__init__(errors[0])
+        self.errors = errors
 
-    allowed_extensions = {".csv", ".xlsx", ".xls"}
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            400,
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}",
-        )
 
-    # Create temporary file
+async def _stream_to_tmp(
+    file: UploadFile, fd: int, file_type: str, file_ext: str
+) -> tuple[int, str]:
+    """
+    Stream an upload straight to the open temp file descriptor ``fd``.
+    Returns the byte count and SHA-256 hex digest of the content.
+    Raises 413 as soon as the running total exceeds ``MAX_BYTES`` and
+    ``_CsvHeaderError`` if a CSV header lacks the required columns, before the
+    rest is written.
+    """
+    loop = asyncio.get_running_loop()
+    digest = hashlib.sha256()
+    total = 0
+    buffers: list[bytearray] = []
+    batch: list[memoryview] = []
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            tmp_path = Path(tmp_file.name)
-
-        # Read and save uploaded content asynchronously
-        content = await file.read()
-
-        # Check file size if not available from file object
-        if len(content) > MAX_MB * 1024**2:
-            raise HTTPException(413, detail=f"File too large. Maximum size: {MAX_MB}MB")
-
-        async with aiofiles.open(tmp_path, "wb") as f:
-            await f.write(content)
+        while True:
+            buf = _acquire_buffer()
+            buffers.append(buf)
+            n = await to_thread.run_sync(file.file.readinto, buf)
+            if not n:
+                break
+            chunk = memoryview(buf)[:n]
+            if total == 0 and file_ext == ".csv":
+                head = bytes(chunk[:HEADER_SNIFF_BYTES])
+                header_end = head.find(b"\n")
+                if header_end >= 0:
+                    header_errors = validate_csv_header(head[:header_end], file_type)
+                    if header_errors:
+                        raise _CsvHeaderError(header_errors)
+            total += n
+            if total > MAX_BYTES:
+                raise HTTPException(
+                    413, detail=f"File too large. Maximum size: {MAX_MB}MB"
+                )
+            digest.update(chunk)
+            batch.append(chunk)
+            if len(batch) >= WRITE_BATCH:
+                await loop.run_in_executor(None, _writev_all, fd, batch)
+                batch = []
+                _release_buffers(buffers)
+                buffers = []
+        if batch:
+            await loop.run_in_executor(None, _writev_all, fd, batch)
+    finally:
+        _release_buffers(buffers)
+    return total, digest.hexdigest()
+
+
+async def _handle_upload(
+    request: Request,
+    file: UploadFile,
+    file_type: Literal["fund", "index"],
+    background_tasks: BackgroundTasks,
+) -> UploadResponse:
+    """
+    Shared upload pipeline: stream to disk, validate and register the file.
+    """
+    file_id = str(new_upload_id())
+    label = file_type.capitalize()
+    # Skip building the log extras when INFO records would be dropped anyway
+    log_info = logger.isEnabledFor(logging.INFO)
 
+    if log_info:
         logger.info(
-            "Index file saved to temporary location",
+            f"{label} upload request started",
             extra={
                 "file_id": file_id,
-                "temp_path": str(tmp_path),
-                "file_size": len(content),
+                "file_name": file.filename,
+                "content_type": file.content_type,
+                "file_size": file.size,
             },
         )
 
-        # Validate file
-        validation_result = validate_file_comprehensive(tmp_path, "index")
-
-        if validation_result.is_valid:
-            # Store file info for later analysis
-            uploaded_files[file_id] = {
-                "filename": file.filename,
-                "temp_path": str(tmp_path),
-                "file_type": "index",
-                "validation": validation_result,
-                "upload_timestamp": utc_now().isoformat(),
-            }
+    # Single lookup gates filename, content type and extension together
+    filename = file.filename or ""
+    dot = filename.rfind(".")
+    file_ext = filename[dot:].lower() if dot >= 0 else ""
+    if UPLOAD_DISPATCH.get((file.content_type, file_ext)) is None:
+        raise HTTPException(415, detail=f"Unsupported file. Allowed: {ALLOWED_STR}")
 
-            # Insert UploadFileMeta row if database is available
-            upload_meta = None
-            if DATABASE_AVAILABLE and UploadFileMeta:
-                # Skip database operations for now - running in memory mode
-                pass
+    # File size validation
+    size = file.size
+    if size is not None and size > MAX_BYTES:
+        raise HTTPException(413, detail=f"File too large. Maximum size: {MAX_MB}MB")
 
+    # Write to a per-upload file named after its id; error paths remove it only
+    # once this request has created it
+    tmp_path = UPLOAD_DIR / f"{file_id}{file_ext}"
+    created = False
+    try:
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | O_BINARY, 0o600)
+        created = True
+        try:
+            # Reserve the extents up front when the part size is known
+            if HAS_FALLOCATE and size:
+                try:
+                    os.posix_fallocate(fd, 0, size)
+                except OSError as e:
+                    # Fail before streaming when the disk is full; filesystems
+                    # that cannot preallocate simply skip the reservation
+                    if e.errno == errno.ENOSPC:
+                        raise HTTPException(
+                            507, detail="Insufficient storage for upload"
+                        ) from e
+
+            # Stream uploaded content to disk, enforcing the size limit as we go
+            file_size, sha256 = await _stream_to_tmp(file, fd, file_type, file_ext)
+            if size and file_size != size:
+                os.ftruncate(fd, file_size)
+        finally:
+            os.close(fd)
+
+        if log_info:
             logger.info(
-                "Index file validated successfully",
+                f"{label} file saved to temporary location",
                 extra={
                     "file_id": file_id,
-                    "upload_id": getattr(upload_meta, "id", None),
-                    "row_count": (
-                        validation_result.metadata.row_count
-                        if validation_result.metadata
-                        else None
-                    ),
-                    "detected_columns": validation_result.detected_mappings,
+                    "temp_path": str(tmp_path),
+                    "file_size": file_size,
+                },
+            )
+
+        # Identical content was validated before: reuse that result
+        cache_key = f"{file_type}:{sha256}"
+        cached_result = validation_cache.get(cache_key)
+        if cached_result is None:
+            # Validate off the event loop, in the app's process pool if present
+            pool = getattr(request.app.state, "validator_pool", None)
+            if pool is not None:
+                cached_result = await asyncio.get_running_loop().run_in_executor(
+                    pool, validate_file_comprehensive, tmp_path, file_type
+                )
+            else:
+                cached_result = await to_thread.run_sync(
+                    validate_file_comprehensive,
+                    tmp_path,
+                    file_type,
+                    limiter=_VALIDATOR_LIMIT,
+                )
+            if len(validation_cache) >= VALIDATION_CACHE_SIZE:
+                validation_cache.pop(next(iter(validation_cache)))
+            validation_cache[cache_key] = cached_result
+        validation_result = _stamp_validation(cached_result, tmp_path, file_size)
+
+        if validation_result.is_valid:
+            # Store file info for later analysis
+            await _publish_upload(
+                file_id,
+                {
+                    "filename": file.filename,
+                    "temp_path": str(tmp_path),
+                    "file_type": file_type,
+                    "sha256": sha256,
+                    "validation": validation_result,
+                    "upload_timestamp": iso_now(),
                 },
             )
 
-            message = f"Index file uploaded and validated successfully. {validation_result.metadata.row_count if validation_result.metadata else 'Unknown'} rows detected."
+            # Queue the UploadFileMeta row for the batched database writer
+            meta_queue = getattr(request.app.state, "meta_queue", None)
+            if meta_queue is not None:
+                await meta_queue.put({"filename": file.filename, "user": "anonymous"})
+
+            if log_info:
+                logger.info(
+                    f"{label} file validated successfully",
+                    extra={
+                        "file_id": file_id,
+                        "row_count": (
+                            validation_result.metadata.row_count
+                            if validation_result.metadata
+                            else None
+                        ),
+                        "detected_columns": validation_result.detected_mappings,
+                    },
+                )
+
+            message = f"{label} file uploaded and validated successfully. {validation_result.metadata.row_count if validation_result.metadata else 'Unknown'} rows detected."
 
         else:
             # Clean up temp file on validation failure
             background_tasks.add_task(cleanup_temp_file, tmp_path)
 
             logger.warning(
-                "Index file validation failed",
+                f"{label} file validation failed",
                 extra={
                     "file_id": file_id,
                     "errors": validation_result.errors,
@@ -323,19 +510,64 @@ async def upload_index_file(
             message=message,
         )
 
+    except _CsvHeaderError as e:
+        # Same failed-validation body the full check returns for these errors
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(
+            f"{label} file validation failed",
+            extra={"file_id": file_id, "errors": e.errors, "warnings": []},
+        )
+        return UploadResponse(
+            success=False,
+            file_id=file_id,
+            filename=file.filename,
+            validation=ValidationResult(is_valid=False, errors=e.errors),
+            message=f"File validation failed with {len(e.errors)} errors.",
+        )
+    except HTTPException:
+        # Error responses never run background tasks, so remove the file now
+        if created:
+            tmp_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
         logger.error(
-            "Index upload processing failed",
+            f"{label} upload processing failed",
             extra={"file_id": file_id, "error": str(e)},
         )
 
         # Clean up temp file on error
-        if "tmp_path" in locals():
-            background_tasks.add_task(cleanup_temp_file, tmp_path)
+        if created:
+            tmp_path.unlink(missing_ok=True)
 
         raise HTTPException(500, detail=f"File processing failed: {str(e)}")
 
 
+@router.post("/fund", response_model=UploadResponse)
+async def upload_fund_file(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Fund cashflow file (CSV/Excel)"),
+) -> UploadResponse:
+    """
+    Upload and validate fund cashflow file.
+    Returns validation results and file ID for subsequent analysis.
+    """
+    return await _handle_upload(request, file, "fund", background_tasks)
+
+
+@router.post("/index", response_model=UploadResponse)
+async def upload_index_file(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Index price file (CSV/Excel)"),
+) -> UploadResponse:
+    """
+    Upload and validate index price file.
+    Returns validation results and file ID for subsequent analysis.
+    """
+    return await _handle_upload(request, file, "index", background_tasks)
+
+
 @router.get("")
 async def get_uploads(
     skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)
@@ -377,7 +609,7 @@ async def get_upload(upload_id: int) -> dict[str, Any]:
 
 
 @router.get("/files")
-async def list_uploaded_files() -> dict[str, Any]:
+async def list_uploaded_files() -> ORJSONResponse:
     """
     List all uploaded files currently in memory.
     This endpoint provides information about files available for analysis.
@@ -400,7 +632,9 @@ async def list_uploaded_files() -> dict[str, Any]:
                 }
             )
 
-        return {"success": True, "files": files_info, "total_files": len(files_info)}
+        return ORJSONResponse(
+            {"success": True, "files": files_info, "total_files": len(files_info)}
+        )
 
     except Exception as e:
         logger.error(f"Failed to list files: {e}")
@@ -408,61 +642,112 @@ async def list_uploaded_files() -> dict[str, Any]:
 
 
 @router.get("/files/{file_id}")
-async def get_file_info(file_id: str) -> dict[str, Any]:
+async def get_file_info(file_id: str) -> ORJSONResponse:
     """
     Get detailed information about a specific uploaded file.
     """
-    if file_id not in uploaded_files:
-        raise HTTPException(404, detail="File not found")
-
     try:
-        file_data = uploaded_files[file_id]
-        return {"success": True, "file_info": file_data}
-
+        file_data = await _lookup_upload(file_id)
     except Exception as e:
         logger.error(f"Failed to get file info for {file_id}: {e}")
         raise HTTPException(500, detail="Failed to retrieve file information")
 
+    if file_data is None:
+        raise HTTPException(404, detail="File not found")
+
+    return ORJSONResponse({"success": True, "file_info": _jsonable_record(file_data)})
+
 
 @router.delete("/files/{file_id}")
 async def delete_uploaded_file(
     file_id: str, background_tasks: BackgroundTasks
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """
     Delete an uploaded file from memory and clean up temporary files.
     """
-    if file_id not in uploaded_files:
+    file_data = await _lookup_upload(file_id)
+    if file_data is None:
         raise HTTPException(404, detail="File not found")
 
     try:
-        file_data = uploaded_files[file_id]
         temp_path = Path(file_data["temp_path"])
 
         # Schedule cleanup of temporary file
         background_tasks.add_task(cleanup_temp_file, temp_path)
 
-        # Remove from memory
-        del uploaded_files[file_id]
+        # Remove from memory and the shared cache
+        uploaded_files.pop(file_id, None)
+        await cache_delete(f"{UPLOAD_KEY_PREFIX}{file_id}")
 
         logger.info(f"File {file_id} deleted successfully")
 
-        return {
-            "success": True,
-            "message": f'File {file_data["filename"]} deleted successfully',
-        }
+        return ORJSONResponse(
+            {
+                "success": True,
+                "message": f"File {file_data['filename']} deleted successfully",
+            }
+        )
 
     except Exception as e:
         logger.error(f"Failed to delete file {file_id}: {e}")
         raise HTTPException(500, detail="Failed to delete file")
 
 
-async def cleanup_temp_file(file_path: Path) -> None:
+async def sweep_expired_uploads(interval: float = UPLOAD_SWEEP_INTERVAL) -> None:
+    """
+    Background loop evicting expired uploads so their temp files are removed
+    even when no new upload arrives to trigger expiry.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        uploaded_files.expire()
+
+
+async def flush_upload_meta(queue: asyncio.Queue) -> None:
+    """
+    Background writer draining queued UploadFileMeta rows in bulk inserts of up
+    to META_BATCH_SIZE rows, so a burst of uploads shares one commit.
+    """
+    while True:
+        batch = [await queue.get()]
+        # Give the rest of a burst a moment to arrive before committing
+        await asyncio.sleep(META_FLUSH_INTERVAL)
+        while len(batch) < META_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        try:
+            async with async_session() as session:
+                await create_upload_records(session, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} upload records: {e}")
+
+
+def _unlink_temp_files(file_paths: Iterable[str | os.PathLike]) -> int:
+    """Delete files without a prior existence check; returns how many were removed."""
+    removed = 0
+    for file_path in file_paths:
+        try:
+            os.unlink(file_path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to cleanup temporary file {file_path}: {e}")
+    return removed
+
+
+async def cleanup_temp_file(file_path: str | os.PathLike) -> None:
     """
     Background task to clean up temporary files.
     """
-    try:
-        if file_path.exists():
-            file_path.unlink()
-            logger.info(f"Temporary file cleaned up: {file_path}")
-    except Exception as e:
-        logger.error(f"Failed to cleanup temporary file {file_path}: {e}")
+    if _unlink_temp_files((file_path,)):
+        logger.info(f"Temporary file cleaned up: {file_path}")
+
+
+async def cleanup_temp_files(file_paths: Iterable[str | os.PathLike]) -> None:
+    """
+    Background task removing a batch of temporary files, e.g. evicted uploads.
+    """
+    removed = _unlink_temp_files(file_paths)
+    if removed:
+        logger.info(f"Cleaned up {removed} temporary files")
@@ -1,23 +1,54 @@
 import logging
 from typing import Any
 
+import orjson
 import pandas as pd
-from data_processor import IntelligentDataProcessor
+from data_processor import IntelligentDataProcessor, OptimalDataStructure
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from utils.arrow_csv import read_csv
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Global variables for storing processed data
-fund_data = None
-index_data = None
+# Shared processor; its compiled patterns are built once at import
+data_processor = IntelligentDataProcessor()
+
+# Column names that mark a dataset as fund data
+_FUND_COLS = frozenset({"cashflow", "contribution", "distribution", "nav"})
+
+# Detected column types scored towards each structure; "date" counts as fund
+_FUND_TYPES = frozenset({"date", "nav", "cashflow", "contribution", "distribution"})
+_INDEX_TYPES = frozenset({"index_value", "price"})
+
+# Most recent calculation-ready structure; swapped in with one assignment so
+# concurrent requests never see fund data paired with another upload's index
+latest_structure: OptimalDataStructure | None = None
+
+
+def _preview_records(df: pd.DataFrame, rows: int = 5) -> list[dict[str, Any]]:
+    """First rows as JSON-ready records, encoded by pandas' C JSON writer."""
+    return orjson.loads(
+        df.head(rows).to_json(orient="records", date_format="iso", date_unit="s")
+    )
+
+
+def _first_nonnull(series: pd.Series, k: int = 10) -> list[Any]:
+    """First ``k`` non-null values, found by a scan that stops once it has them."""
+    positions = []
+    for i, value in enumerate(series.to_numpy()):
+        if not pd.isna(value):
+            positions.append(i)
+            if len(positions) == k:
+                break
+    return series.iloc[positions].tolist()
 
 
 @router.post("/process-datasets")
-async def process_datasets(request: Request) -> dict[str, Any]:
+async def process_datasets(request: Request) -> ORJSONResponse:
     """
     Intelligent processing of multiple datasets to create optimal data structure for PME calculations
 
@@ -37,18 +68,11 @@ async def process_datasets(request: Request) -> dict[str, Any]:
         for _key, file in form.items():
             if hasattr(file, "filename") and hasattr(file, "read") and file.filename:
                 try:
-                    # Read file content
-                    content = await file.read()
-
-                    # Determine file type and read accordingly
+                    # Parse from the spooled upload rather than copying it into memory
                     if file.filename.endswith(".csv"):
-                        import io
-
-                        df = pd.read_csv(io.StringIO(content.decode("utf-8")))
+                        df = read_csv(file.file)
                     elif file.filename.endswith((".xlsx", ".xls")):
-                        import io
-
-                        df = pd.read_excel(io.BytesIO(content))
+                        df = pd.read_excel(file.file)
                     else:
                         continue
 
@@ -57,11 +81,7 @@ async def process_datasets(request: Request) -> dict[str, Any]:
                     datasets[dataset_name] = df
 
                     # If this contains fund-like data, make it primary
-                    if any(
-                        col.lower()
-                        in ["cashflow", "contribution", "distribution", "nav"]
-                        for col in df.columns
-                    ):
+                    if any(col.lower() in _FUND_COLS for col in df.columns):
                         primary_dataset = dataset_name
 
                 except Exception as e:
@@ -71,19 +91,15 @@ async def process_datasets(request: Request) -> dict[str, Any]:
         if not datasets:
             raise HTTPException(status_code=400, detail="No valid datasets provided")
 
-        # Initialize intelligent processor
-        processor = IntelligentDataProcessor()
-
         # Create optimal data structure
-        optimal_structure = processor.create_optimal_structure(
+        optimal_structure = data_processor.create_optimal_structure(
             datasets, primary_dataset
         )
 
         # Store processed data in global state for analysis
         if optimal_structure.calculation_ready:
-            global fund_data, index_data
-            fund_data = optimal_structure.fund_data
-            index_data = optimal_structure.index_data
+            global latest_structure
+            latest_structure = optimal_structure
 
         # Convert metadata to serializable format
         metadata_dict = {}
@@ -127,23 +143,25 @@ async def process_datasets(request: Request) -> dict[str, Any]:
                 ],
             }
 
-        return {
-            "success": True,
-            "calculation_ready": optimal_structure.calculation_ready,
-            "metadata": metadata_dict,
-            "warnings": optimal_structure.warnings,
-            "suggestions": optimal_structure.suggestions,
-            "fund_data_preview": (
-                optimal_structure.fund_data.head(5).to_dict(orient="records")
-                if not optimal_structure.fund_data.empty
-                else []
-            ),
-            "index_data_preview": (
-                optimal_structure.index_data.head(5).to_dict(orient="records")
-                if optimal_structure.index_data is not None
-                else None
-            ),
-        }
+        return ORJSONResponse(
+            {
+                "success": True,
+                "calculation_ready": optimal_structure.calculation_ready,
+                "metadata": metadata_dict,
+                "warnings": optimal_structure.warnings,
+                "suggestions": optimal_structure.suggestions,
+                "fund_data_preview": (
+                    _preview_records(optimal_structure.fund_data)
+                    if not optimal_structure.fund_data.empty
+                    else []
+                ),
+                "index_data_preview": (
+                    _preview_records(optimal_structure.index_data)
+                    if optimal_structure.index_data is not None
+                    else None
+                ),
+            }
+        )
 
     except Exception as e:
         logger.error(f"Error in intelligent data processing: {str(e)}")
@@ -151,7 +169,7 @@ async def process_datasets(request: Request) -> dict[str, Any]:
 
 
 @router.post("/analyze-columns")
-async def analyze_columns(request: Request) -> dict[str, Any]:
+async def analyze_columns(request: Request) -> ORJSONResponse:
     """
     Analyze column types and suggest optimal mappings for a dataset
     """
@@ -166,15 +184,14 @@ async def analyze_columns(request: Request) -> dict[str, Any]:
         # Convert to DataFrame
         df = pd.DataFrame(sample_data)
 
-        # Initialize processor
-        processor = IntelligentDataProcessor()
+        # Detect every column's type in one batch
+        samples = {col: _first_nonnull(df[col]) for col in df.columns}
+        mappings = data_processor.detect_column_types(df, samples)
 
-        # Analyze each column
         column_analysis = []
-        for col in df.columns:
-            sample_values = df[col].dropna().head(10).tolist()
-            mapping = processor.detect_column_type(col, sample_values)
-
+        for col, mapping in zip(df.columns, mappings, strict=True):
+            sample_values = samples[col]
+            missing_values = int(df[col].isna().sum())
             column_analysis.append(
                 {
                     "original_name": mapping.original_name,
@@ -182,24 +199,26 @@ async def analyze_columns(request: Request) -> dict[str, Any]:
                     "data_type": mapping.data_type.value,
                     "confidence": mapping.confidence,
                     "sample_values": sample_values[:5],  # First 5 sample values
-                    "total_values": len(df[col].dropna()),
-                    "missing_values": len(df[col]) - len(df[col].dropna()),
+                    "total_values": len(df) - missing_values,
+                    "missing_values": missing_values,
                     "suggested_transformations": [],
                 }
             )
 
-        return {
-            "success": True,
-            "total_columns": len(df.columns),
-            "total_rows": len(df),
-            "column_analysis": column_analysis,
-            "recommendations": [
-                "Columns with confidence < 0.7 may need manual review",
-                "Date columns will be automatically standardized",
-                "Currency columns will have symbols and formatting removed",
-                "Missing values will be handled appropriately for each data type",
-            ],
-        }
+        return ORJSONResponse(
+            {
+                "success": True,
+                "total_columns": len(df.columns),
+                "total_rows": len(df),
+                "column_analysis": column_analysis,
+                "recommendations": [
+                    "Columns with confidence < 0.7 may need manual review",
+                    "Date columns will be automatically standardized",
+                    "Currency columns will have symbols and formatting removed",
+                    "Missing values will be handled appropriately for each data type",
+                ],
+            }
+        )
 
     except Exception as e:
         logger.error(f"Error in column analysis: {str(e)}")
@@ -207,7 +226,7 @@ async def analyze_columns(request: Request) -> dict[str, Any]:
 
 
 @router.post("/suggest-structure")
-async def suggest_optimal_structure(request: Request) -> dict[str, Any]:
+async def suggest_optimal_structure(request: Request) -> ORJSONResponse:
     """
     Suggest optimal data structure for PME calculations based on detected columns
     """
@@ -239,18 +258,23 @@ async def suggest_optimal_structure(request: Request) -> dict[str, Any]:
             "recommendations": [],
         }
 
-        # Analyze detected types
+        # Analyze detected types in one pass
         fund_data_score = 0
         index_data_score = 0
+        detected_type_names = set()
+        low_confidence_count = 0
 
         for col_info in detected_types:
-            col_type = col_info.get("data_type")
+            col_type = col_info["data_type"]
             confidence = col_info.get("confidence", 0)
+            detected_type_names.add(col_type)
 
-            if col_type in ["date", "nav", "cashflow", "contribution", "distribution"]:
+            if col_type in _FUND_TYPES:
                 fund_data_score += confidence
-            elif col_type in ["date", "index_value", "price"]:
+            elif col_type in _INDEX_TYPES:
                 index_data_score += confidence
+            if confidence < 0.7:
+                low_confidence_count += 1
 
         # Determine data structure type
         if fund_data_score > index_data_score:
@@ -265,8 +289,6 @@ async def suggest_optimal_structure(request: Request) -> dict[str, Any]:
             )
 
         # Check for missing requirements
-        detected_type_names = {col["data_type"] for col in detected_types}
-
         if "date" not in detected_type_names:
             suggestions["missing_requirements"].append(
                 "Date column is required for all calculations"
@@ -300,19 +322,16 @@ async def suggest_optimal_structure(request: Request) -> dict[str, Any]:
             )
 
         # Column-specific recommendations
-        low_confidence_cols = [
-            col for col in detected_types if col.get("confidence", 0) < 0.7
-        ]
-        if low_confidence_cols:
+        if low_confidence_count:
             suggestions["recommendations"].append(
-                f"📝 Review {len(low_confidence_cols)} columns with low detection confidence"
+                f"📝 Review {low_confidence_count} columns with low detection confidence"
             )
 
         suggestions["recommendations"].append(
             "🔄 Use the 'Process Datasets' endpoint to automatically optimize your data structure"
         )
 
-        return {"success": True, "suggestions": suggestions}
+        return ORJSONResponse({"success": True, "suggestions": suggestions})
 
     except Exception as e:
         logger.error(f"Error in structure suggestion: {str(e)}")
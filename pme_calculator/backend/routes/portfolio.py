@@ -1,8 +1,14 @@
-import io
+import asyncio
 import logging
+import math
+import tempfile
+import time
+from collections.abc import Callable, Coroutine, Iterator
 from datetime import datetime
-from typing import Any
+from functools import partial
+from typing import Any, BinaryIO
 
+from cache import cache_delete, cache_get, cache_set
 from database import get_db  # Assume this exists
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.concurrency import run_in_threadpool
@@ -10,14 +16,29 @@ from fastapi.responses import StreamingResponse
 from models import Fund, Portfolio, PortfolioFund
 from portfolio_service import PortfolioService
 from reporting import ReportingService
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-
-# Import our central timezone utility
-from pme_calculator.utils.time import utc_now
+from utils.time import utc_now_naive
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
+# Cache-aside keys for read endpoints; writes invalidate the affected portfolio
+PORTFOLIO_KEY_PREFIX = "pme:portfolio:"
+PORTFOLIO_LIST_PREFIX = f"{PORTFOLIO_KEY_PREFIX}list:"
+# List keys embed this version and writes replace it rather than scanning for
+# keys; with the same TTL, a version outlasts every page cached before it, so
+# falling back to 0 on expiry cannot revive a stale page
+PORTFOLIO_LIST_VERSION_KEY = f"{PORTFOLIO_KEY_PREFIX}list_version"
+PORTFOLIO_CACHE_TTL = 300  # 5 minutes
+
+# Reports are spooled to disk past this size and streamed back in chunks
+REPORT_SPOOL_SIZE = 8 * 1024 * 1024
+REPORT_CHUNK_SIZE = 64 * 1024
+
+# Submitted weights may round, e.g. three funds at 0.333 each
+WEIGHT_SUM_TOLERANCE = 0.01
+
 # Pydantic models for request/response
 from pydantic import BaseModel
 
@@ -56,6 +77,46 @@ class WeightUpdate(BaseModel):
     weight: float
 
 
+def _with_fund_counts(db: Session):
+    """Query yielding (portfolio, num_funds) rows in a single grouped SELECT."""
+    return (
+        db.query(Portfolio, func.count(PortfolioFund.id).label("num_funds"))
+        .outerjoin(PortfolioFund, PortfolioFund.portfolio_id == Portfolio.id)
+        .group_by(Portfolio.id)
+    )
+
+
+async def _invalidate_portfolio(portfolio_id: int | None = None) -> None:
+    """Drop cached reads affected by a write to one portfolio, or to the list."""
+    if portfolio_id is not None:
+        await cache_delete(f"{PORTFOLIO_KEY_PREFIX}{portfolio_id}")
+        await cache_delete(f"{PORTFOLIO_KEY_PREFIX}{portfolio_id}:analytics")
+    await cache_set(
+        PORTFOLIO_LIST_VERSION_KEY,
+        {"version": time.time_ns()},
+        ttl=PORTFOLIO_CACHE_TTL,
+    )
+
+
+async def _portfolio_list_version() -> int:
+    """Current list-cache version; 0 until the first write."""
+    cached = await cache_get(PORTFOLIO_LIST_VERSION_KEY)
+    return cached["version"] if cached else 0
+
+
+def _portfolio_response(portfolio: Portfolio, num_funds: int) -> PortfolioResponse:
+    return PortfolioResponse(
+        id=portfolio.id,
+        name=portfolio.name,
+        description=portfolio.description,
+        benchmark_symbol=portfolio.benchmark_symbol,
+        risk_free_rate=portfolio.risk_free_rate,
+        created_at=portfolio.created_at,
+        updated_at=portfolio.updated_at,
+        num_funds=num_funds,
+    )
+
+
 @router.post("/", response_model=PortfolioResponse)
 async def create_portfolio(
     portfolio_data: PortfolioCreate, db: Session = Depends(get_db)
@@ -64,40 +125,38 @@ async def create_portfolio(
     try:
         portfolio_service = PortfolioService(db)
 
-        # Validate that all fund IDs exist
-        for fund_id in portfolio_data.fund_ids:
-            fund = db.query(Fund).filter(Fund.id == fund_id).first()
-            if not fund:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Fund {fund_id} not found",
-                )
+        # Validate that all fund IDs exist with a single IN query
+        found = {
+            fund_id
+            for (fund_id,) in db.query(Fund.id).filter(
+                Fund.id.in_(portfolio_data.fund_ids)
+            )
+        }
+        missing = set(portfolio_data.fund_ids) - found
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Funds not found: {sorted(missing)}",
+            )
 
-        # Create portfolio
+        # Create portfolio with its settings, committed in one transaction
         portfolio = await portfolio_service.build_portfolio(
-            fund_ids=portfolio_data.fund_ids, portfolio_name=portfolio_data.name
+            fund_ids=portfolio_data.fund_ids,
+            portfolio_name=portfolio_data.name,
+            description=portfolio_data.description,
+            benchmark_symbol=portfolio_data.benchmark_symbol,
+            risk_free_rate=portfolio_data.risk_free_rate,
         )
-
-        # Update additional fields
-        portfolio.description = portfolio_data.description
-        portfolio.benchmark_symbol = portfolio_data.benchmark_symbol
-        portfolio.risk_free_rate = portfolio_data.risk_free_rate
         db.commit()
+        await _invalidate_portfolio()
 
         # Get fund count for response
         num_funds = len(portfolio_data.fund_ids)
 
-        return PortfolioResponse(
-            id=portfolio.id,
-            name=portfolio.name,
-            description=portfolio.description,
-            benchmark_symbol=portfolio.benchmark_symbol,
-            risk_free_rate=portfolio.risk_free_rate,
-            created_at=portfolio.created_at,
-            updated_at=portfolio.updated_at,
-            num_funds=num_funds,
-        )
+        return _portfolio_response(portfolio, num_funds)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating portfolio: {str(e)}")
         raise HTTPException(
@@ -107,39 +166,38 @@ async def create_portfolio(
 
 @router.get("/", response_model=list[PortfolioResponse])
 async def get_portfolios(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    skip: int = 0,
+    limit: int = 100,
+    cursor: int | None = None,
+    db: Session = Depends(get_db),
 ) -> list[PortfolioResponse]:
-    """Get all portfolios with pagination."""
+    """
+    Get all portfolios with pagination, ordered by id.
+
+    Pass the last id of a page as ``cursor`` to fetch the next one; the index
+    seeks straight to it instead of scanning past ``skip`` rows.
+    """
     try:
-        portfolios = (
-            db.query(Portfolio)
-            .filter(Portfolio.is_active)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        version = await _portfolio_list_version()
+        cache_key = f"{PORTFOLIO_LIST_PREFIX}{version}:{skip}:{limit}:{cursor}"
+        if cached := await cache_get(cache_key):
+            return cached["items"]
+
+        query = _with_fund_counts(db).filter(Portfolio.is_active).order_by(Portfolio.id)
+        if cursor is not None:
+            query = query.filter(Portfolio.id > cursor)
+        else:
+            query = query.offset(skip)
+        rows = query.limit(limit).all()
+
+        result = [
+            _portfolio_response(portfolio, num_funds) for portfolio, num_funds in rows
+        ]
+        await cache_set(
+            cache_key,
+            {"items": [item.model_dump(mode="json") for item in result]},
+            ttl=PORTFOLIO_CACHE_TTL,
         )
-
-        result = []
-        for portfolio in portfolios:
-            num_funds = (
-                db.query(PortfolioFund)
-                .filter(PortfolioFund.portfolio_id == portfolio.id)
-                .count()
-            )
-
-            result.append(
-                PortfolioResponse(
-                    id=portfolio.id,
-                    name=portfolio.name,
-                    description=portfolio.description,
-                    benchmark_symbol=portfolio.benchmark_symbol,
-                    risk_free_rate=portfolio.risk_free_rate,
-                    created_at=portfolio.created_at,
-                    updated_at=portfolio.updated_at,
-                    num_funds=num_funds,
-                )
-            )
-
         return result
 
     except Exception as e:
@@ -155,33 +213,28 @@ async def get_portfolio(
 ) -> PortfolioResponse:
     """Get a specific portfolio."""
     try:
-        portfolio = (
-            db.query(Portfolio)
+        cache_key = f"{PORTFOLIO_KEY_PREFIX}{portfolio_id}"
+        if cached := await cache_get(cache_key):
+            return cached
+
+        row = (
+            _with_fund_counts(db)
             .filter(Portfolio.id == portfolio_id, Portfolio.is_active)
             .first()
         )
 
-        if not portfolio:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found"
             )
 
-        num_funds = (
-            db.query(PortfolioFund)
-            .filter(PortfolioFund.portfolio_id == portfolio_id)
-            .count()
-        )
+        portfolio, num_funds = row
 
-        return PortfolioResponse(
-            id=portfolio.id,
-            name=portfolio.name,
-            description=portfolio.description,
-            benchmark_symbol=portfolio.benchmark_symbol,
-            risk_free_rate=portfolio.risk_free_rate,
-            created_at=portfolio.created_at,
-            updated_at=portfolio.updated_at,
-            num_funds=num_funds,
+        response = _portfolio_response(portfolio, num_funds)
+        await cache_set(
+            cache_key, response.model_dump(mode="json"), ttl=PORTFOLIO_CACHE_TTL
         )
+        return response
 
     except HTTPException:
         raise
@@ -198,41 +251,29 @@ async def update_portfolio(
 ) -> PortfolioResponse:
     """Update portfolio details."""
     try:
-        portfolio = (
-            db.query(Portfolio)
+        row = (
+            _with_fund_counts(db)
             .filter(Portfolio.id == portfolio_id, Portfolio.is_active)
             .first()
         )
 
-        if not portfolio:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found"
             )
 
+        # Editing details leaves fund membership, and so num_funds, unchanged
+        portfolio, num_funds = row
+
         # Update fields
         update_data = portfolio_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(portfolio, field, value)
 
-        portfolio.updated_at = utc_now()
         db.commit()
+        await _invalidate_portfolio(portfolio_id)
 
-        num_funds = (
-            db.query(PortfolioFund)
-            .filter(PortfolioFund.portfolio_id == portfolio_id)
-            .count()
-        )
-
-        return PortfolioResponse(
-            id=portfolio.id,
-            name=portfolio.name,
-            description=portfolio.description,
-            benchmark_symbol=portfolio.benchmark_symbol,
-            risk_free_rate=portfolio.risk_free_rate,
-            created_at=portfolio.created_at,
-            updated_at=portfolio.updated_at,
-            num_funds=num_funds,
-        )
+        return _portfolio_response(portfolio, num_funds)
 
     except HTTPException:
         raise
@@ -249,20 +290,16 @@ async def delete_portfolio(
 ) -> dict[str, str]:
     """Soft delete a portfolio."""
     try:
-        portfolio = (
-            db.query(Portfolio)
-            .filter(Portfolio.id == portfolio_id, Portfolio.is_active)
-            .first()
-        )
+        portfolio = db.get(Portfolio, portfolio_id)
 
-        if not portfolio:
+        if not portfolio or not portfolio.is_active:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found"
             )
 
         portfolio.is_active = False
-        portfolio.updated_at = utc_now()
         db.commit()
+        await _invalidate_portfolio(portfolio_id)
 
         return {"message": "Portfolio deleted successfully"}
 
@@ -281,11 +318,16 @@ async def get_portfolio_analytics(
 ) -> dict[str, Any]:
     """Get comprehensive portfolio analytics."""
     try:
+        cache_key = f"{PORTFOLIO_KEY_PREFIX}{portfolio_id}:analytics"
+        if cached := await cache_get(cache_key):
+            return cached
+
         # Run heavy computation in thread pool
         analytics = await run_in_threadpool(
             _calculate_portfolio_analytics_sync, portfolio_id, db
         )
 
+        await cache_set(cache_key, analytics, ttl=PORTFOLIO_CACHE_TTL)
         return analytics
 
     except Exception as e:
@@ -300,7 +342,7 @@ def _calculate_portfolio_analytics_sync(
 ) -> dict[str, Any]:
     """Synchronous portfolio analytics calculation for thread pool execution."""
     portfolio_service = PortfolioService(db)
-    return portfolio_service.calc_portfolio_kpis(portfolio_id)
+    return asyncio.run(portfolio_service.calc_portfolio_kpis(portfolio_id))
 
 
 @router.put("/{portfolio_id}/weights")
@@ -310,46 +352,45 @@ async def update_portfolio_weights(
     """Update portfolio fund weights."""
     try:
         # Validate portfolio exists
-        portfolio = (
-            db.query(Portfolio)
-            .filter(Portfolio.id == portfolio_id, Portfolio.is_active)
-            .first()
-        )
+        portfolio = db.get(Portfolio, portfolio_id)
 
-        if not portfolio:
+        if not portfolio or not portfolio.is_active:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found"
             )
 
-        # Validate weights sum to 1
-        total_weight = sum(w.weight for w in weights)
-        if abs(total_weight - 1.0) > 0.01:  # Allow small floating point errors
+        # Validate weights sum to 1; fsum rounds once, however many funds
+        total_weight = math.fsum(w.weight for w in weights)
+        if not math.isclose(total_weight, 1.0, abs_tol=WEIGHT_SUM_TOLERANCE):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Weights must sum to 1.0, got {total_weight}",
             )
 
-        # Update weights
-        for weight_update in weights:
-            portfolio_fund = (
-                db.query(PortfolioFund)
-                .filter(
-                    PortfolioFund.portfolio_id == portfolio_id,
-                    PortfolioFund.fund_id == weight_update.fund_id,
-                )
-                .first()
+        # Resolve every fund's membership row with one IN query
+        row_ids = dict(
+            db.query(PortfolioFund.fund_id, PortfolioFund.id).filter(
+                PortfolioFund.portfolio_id == portfolio_id,
+                PortfolioFund.fund_id.in_([w.fund_id for w in weights]),
             )
-
-            if not portfolio_fund:
+        )
+        for weight_update in weights:
+            if weight_update.fund_id not in row_ids:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Fund {weight_update.fund_id} not in portfolio",
                 )
 
-            portfolio_fund.weight = weight_update.weight
+        # Update weights as one executemany keyed by primary key
+        db.execute(
+            update(PortfolioFund),
+            [{"id": row_ids[w.fund_id], "weight": w.weight} for w in weights],
+        )
 
-        portfolio.updated_at = utc_now()
+        # Only fund rows changed, so stamp the portfolio row explicitly
+        portfolio.updated_at = utc_now_naive()
         db.commit()
+        await _invalidate_portfolio(portfolio_id)
 
         return {"message": "Portfolio weights updated successfully"}
 
@@ -369,11 +410,11 @@ async def add_fund_to_portfolio(
     """Add a fund to portfolio."""
     try:
         # Validate portfolio and fund exist
-        portfolio = db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
+        portfolio = db.get(Portfolio, portfolio_id)
         if not portfolio:
             raise HTTPException(status_code=404, detail="Portfolio not found")
 
-        fund = db.query(Fund).filter(Fund.id == fund_id).first()
+        fund = db.get(Fund, fund_id)
         if not fund:
             raise HTTPException(status_code=404, detail="Fund not found")
 
@@ -396,6 +437,7 @@ async def add_fund_to_portfolio(
         )
         db.add(portfolio_fund)
         db.commit()
+        await _invalidate_portfolio(portfolio_id)
 
         return {"message": "Fund added to portfolio successfully"}
 
@@ -426,6 +468,7 @@ async def remove_fund_from_portfolio(
 
         db.delete(portfolio_fund)
         db.commit()
+        await _invalidate_portfolio(portfolio_id)
 
         return {"message": "Fund removed from portfolio successfully"}
 
@@ -436,61 +479,91 @@ async def remove_fund_from_portfolio(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+ReportWriter = Callable[
+    [ReportingService, Portfolio, BinaryIO], Coroutine[Any, Any, None]
+]
+
+
+def _write_report_sync(
+    write: ReportWriter, portfolio: Portfolio, db: Session, target: BinaryIO
+) -> None:
+    """Synchronous report generation for thread pool execution."""
+    asyncio.run(write(ReportingService(db), portfolio, target))
+
+
+def _iter_report(spool: BinaryIO) -> Iterator[bytes]:
+    """Yield a finished report in chunks, closing its spool file afterwards."""
+    try:
+        spool.seek(0)
+        yield from iter(partial(spool.read, REPORT_CHUNK_SIZE), b"")
+    finally:
+        spool.close()
+
+
+async def _report_response(
+    portfolio_id: int,
+    db: Session,
+    write: ReportWriter,
+    suffix: str,
+    media_type: str,
+) -> StreamingResponse:
+    """Render a report into a spool file and stream it back in chunks."""
+    # Filename comes from the same session before generation starts
+    portfolio = db.get(Portfolio, portfolio_id)
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    filename = f"{portfolio.name.replace(' ', '_')}_report.{suffix}"
+
+    # Closed by _iter_report once the response has been sent
+    spool = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_SIZE)  # noqa: SIM115
+    try:
+        # KPIs, charts and rendering all block; run the whole report off the loop
+        await run_in_threadpool(_write_report_sync, write, portfolio, db, spool)
+    except BaseException:
+        spool.close()
+        raise
+
+    # StreamingResponse reads the sync iterator in the threadpool
+    return StreamingResponse(
+        _iter_report(spool),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
 @router.get("/{portfolio_id}/report/pdf")
 async def download_pdf_report(
     portfolio_id: int, db: Session = Depends(get_db)
-) -> bytes:
+) -> StreamingResponse:
     """Download PDF report for portfolio."""
     try:
-        # Run heavy computation in thread pool
-        pdf_bytes = await run_in_threadpool(_generate_pdf_report_sync, portfolio_id, db)
-
-        portfolio = db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
-        filename = f"{portfolio.name.replace(' ', '_')}_report.pdf"
-
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        return await _report_response(
+            portfolio_id, db, ReportingService.write_pdf, "pdf", "application/pdf"
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating PDF report: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def _generate_pdf_report_sync(portfolio_id: int, db: Session) -> bytes:
-    """Synchronous PDF report generation for thread pool execution."""
-    reporting_service = ReportingService(db)
-    return reporting_service.generate_pdf(portfolio_id)
-
-
 @router.get("/{portfolio_id}/report/excel")
 async def download_excel_report(
     portfolio_id: int, db: Session = Depends(get_db)
-) -> bytes:
+) -> StreamingResponse:
     """Download Excel report for portfolio."""
     try:
-        # Run heavy computation in thread pool
-        excel_bytes = await run_in_threadpool(
-            _generate_excel_report_sync, portfolio_id, db
-        )
-
-        portfolio = db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
-        filename = f"{portfolio.name.replace(' ', '_')}_report.xlsx"
-
-        return StreamingResponse(
-            io.BytesIO(excel_bytes),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        return await _report_response(
+            portfolio_id,
+            db,
+            ReportingService.write_excel,
+            "xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating Excel report: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-
-
-def _generate_excel_report_sync(portfolio_id: int, db: Session) -> bytes:
-    """Synchronous Excel report generation for thread pool execution."""
-    reporting_service = ReportingService(db)
-    return reporting_service.generate_excel(portfolio_id)
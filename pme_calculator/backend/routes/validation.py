@@ -4,26 +4,105 @@ Advanced data validation endpoints with progress tracking.
 """
 
 import asyncio
-import json
+import contextlib
+import csv
 import os
 import tempfile
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
+import orjson
 import pandas as pd
+from cache import cache_delete, cache_get, cache_set
 from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from schemas import (
     ColumnMapping,
+    DataQualityReport,
     DatasetMetadata,
     DataValidator,
 )
+from utils.arrow_csv import read_csv
+from validation.file_check_simple import EXCEL_ENGINE
 
-router = APIRouter(prefix="/api/validation", tags=["validation"])
+router = APIRouter(
+    prefix="/api/validation",
+    tags=["validation"],
+    default_response_class=ORJSONResponse,
+)
 
-# In-memory storage for validation jobs (in production, use Redis/database)
+# Jobs started by this process; every change is mirrored to the shared cache so
+# any worker can report status or stream progress for a job_id
 validation_jobs: dict[str, dict[str, Any]] = {}
+JOB_KEY_PREFIX = "pme:valjob:"
+JOB_TTL = 86_400  # 24 hours
+
+# Finished jobs are dropped from this process after an hour by the reaper
+JOB_MAX_AGE = 3600
+JOB_SWEEP_INTERVAL = 300
+
+# Set when a local job changes, then replaced, so progress streams wake at once;
+# jobs running on other workers are re-read every JOB_POLL_INTERVAL seconds
+_job_events: dict[str, asyncio.Event] = {}
+JOB_POLL_INTERVAL = 1.0
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+HEADER_CHUNK_SIZE = 4096
+
+
+def _notify_job(job_id: str) -> None:
+    """Wake every stream waiting on this job."""
+    if event := _job_events.pop(job_id, None):
+        event.set()
+
+
+async def _save_job(job_id: str, **changes: Any) -> dict[str, Any]:
+    """Apply changes to a local job record and publish it to the shared cache."""
+    job = validation_jobs.setdefault(job_id, {})
+    job.update(changes)
+    await cache_set(f"{JOB_KEY_PREFIX}{job_id}", job, ttl=JOB_TTL)
+    _notify_job(job_id)
+    return job
+
+
+async def _save_upload(file: UploadFile) -> str:
+    """Copy an upload to a temp file in chunks and return its path."""
+    suffix = os.path.splitext(file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            tmp_file.write(chunk)
+    return tmp_file.name
+
+
+async def _discard_job(job_id: str, job: dict[str, Any]) -> None:
+    """Remove a job's temp file and its record from memory and the shared cache."""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(job["file_path"])
+    validation_jobs.pop(job_id, None)
+    await cache_delete(f"{JOB_KEY_PREFIX}{job_id}")
+    _notify_job(job_id)
+
+
+async def reap_stale_jobs(interval: float = JOB_SWEEP_INTERVAL) -> None:
+    """
+    Background loop discarding finished jobs older than JOB_MAX_AGE, so jobs
+    nobody cleans up do not accumulate in memory.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        cutoff = datetime.now() - timedelta(seconds=JOB_MAX_AGE)
+        for job_id, job in list(validation_jobs.items()):
+            if job.get("status") in ("completed", "failed") and (
+                datetime.fromisoformat(job["created_at"]) < cutoff
+            ):
+                await _discard_job(job_id, job)
+
+
+async def _load_job(job_id: str) -> dict[str, Any] | None:
+    """Find a job record, falling back to the shared cache on a local miss."""
+    if job_id in validation_jobs:
+        return validation_jobs[job_id]
+    return await cache_get(f"{JOB_KEY_PREFIX}{job_id}")
 
 
 @router.post("/upload/fund", response_model=dict[str, str])
@@ -40,24 +119,20 @@ async def upload_fund_data(
     job_id = f"fund_validation_{uuid.uuid4().hex[:8]}_{int(datetime.now().timestamp())}"
 
     # Save uploaded file temporarily
-    with tempfile.NamedTemporaryFile(
-        delete=False, suffix=os.path.splitext(file.filename)[1]
-    ) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        temp_path = tmp_file.name
+    temp_path = await _save_upload(file)
 
     # Initialize job status
-    validation_jobs[job_id] = {
-        "status": "uploaded",
-        "filename": file.filename,
-        "file_path": temp_path,
-        "data_type": "fund",
-        "progress": 0,
-        "created_at": datetime.now().isoformat(),
-        "result": None,
-        "error": None,
-    }
+    await _save_job(
+        job_id,
+        status="uploaded",
+        filename=file.filename,
+        file_path=temp_path,
+        data_type="fund",
+        progress=0,
+        created_at=datetime.now().isoformat(),
+        result=None,
+        error=None,
+    )
 
     # Start background validation
     background_tasks.add_task(validate_fund_file_background, job_id, temp_path)
@@ -78,23 +153,19 @@ async def upload_index_data(
         f"index_validation_{uuid.uuid4().hex[:8]}_{int(datetime.now().timestamp())}"
     )
 
-    with tempfile.NamedTemporaryFile(
-        delete=False, suffix=os.path.splitext(file.filename)[1]
-    ) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        temp_path = tmp_file.name
-
-    validation_jobs[job_id] = {
-        "status": "uploaded",
-        "filename": file.filename,
-        "file_path": temp_path,
-        "data_type": "index",
-        "progress": 0,
-        "created_at": datetime.now().isoformat(),
-        "result": None,
-        "error": None,
-    }
+    temp_path = await _save_upload(file)
+
+    await _save_job(
+        job_id,
+        status="uploaded",
+        filename=file.filename,
+        file_path=temp_path,
+        data_type="index",
+        progress=0,
+        created_at=datetime.now().isoformat(),
+        result=None,
+        error=None,
+    )
 
     background_tasks.add_task(validate_index_file_background, job_id, temp_path)
 
@@ -105,11 +176,10 @@ async def upload_index_data(
 async def get_validation_status(job_id: str) -> dict[str, Any]:
     """Get validation job status and results."""
 
-    if job_id not in validation_jobs:
+    job = await _load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = validation_jobs[job_id]
-
     return {
         "job_id": job_id,
         "status": job["status"],
@@ -126,16 +196,17 @@ async def get_validation_status(job_id: str) -> dict[str, Any]:
 async def stream_validation_progress(job_id: str):
     """Stream validation progress via Server-Sent Events."""
 
-    if job_id not in validation_jobs:
+    if await _load_job(job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
     async def event_publisher():
         while True:
-            if job_id not in validation_jobs:
+            # Taken before reading the job so no change after the read is missed
+            changed = _job_events.setdefault(job_id, asyncio.Event())
+            job = await _load_job(job_id)
+            if job is None:
                 break
 
-            job = validation_jobs[job_id]
-
             # Send progress update
             data = {
                 "job_id": job_id,
@@ -149,13 +220,17 @@ async def stream_validation_progress(job_id: str):
             if job["error"]:
                 data["error"] = job["error"]
 
-            yield f"data: {json.dumps(data)}\n\n"
+            yield f"data: {orjson.dumps(data).decode()}\n\n"
 
             # Stop streaming if job is complete
             if job["status"] in ["completed", "failed"]:
                 break
 
-            await asyncio.sleep(1)  # Update every second
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(changed.wait(), JOB_POLL_INTERVAL)
+
+        # The job is finished or gone, so nothing will set its event again
+        _job_events.pop(job_id, None)
 
     return StreamingResponse(
         event_publisher(),
@@ -172,23 +247,21 @@ async def stream_validation_progress(job_id: str):
 @router.post("/analyze/column-mapping")
 async def analyze_column_mapping(
     file: UploadFile = File(...), data_type: str = "fund"
-) -> dict[str, list[ColumnMapping]]:
+) -> dict[str, list[ColumnMapping] | float]:
     """Analyze file columns and suggest intelligent mappings."""
 
     try:
         # Read file headers
         if file.filename.lower().endswith(".csv"):
             # Read just the first row to get column names
-            content = await file.read()
-            lines = content.decode("utf-8").split("\n")
-            columns = [col.strip() for col in lines[0].split(",")] if lines else []
+            header = b""
+            while b"\n" not in header and (chunk := await file.read(HEADER_CHUNK_SIZE)):
+                header += chunk
+            first_line = header.split(b"\n", 1)[0].decode("utf-8")
+            columns = [col.strip() for col in next(csv.reader([first_line]), [])]
         else:
             # For Excel files, read just the header
-            suffix = os.path.splitext(file.filename or "")[1]
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                content = await file.read()
-                tmp_file.write(content)
-                temp_path = tmp_file.name
+            temp_path = await _save_upload(file)
 
             try:
                 df_preview = pd.read_excel(temp_path, nrows=0)  # Just headers
@@ -214,17 +287,11 @@ async def analyze_column_mapping(
 async def cleanup_validation_job(job_id: str) -> dict[str, str]:
     """Clean up validation job and temporary files."""
 
-    if job_id not in validation_jobs:
+    job = await _load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = validation_jobs[job_id]
-
-    # Remove temporary file
-    if os.path.exists(job["file_path"]):
-        os.unlink(job["file_path"])
-
-    # Remove job from memory
-    del validation_jobs[job_id]
+    await _discard_job(job_id, job)
 
     return {"message": "Job cleaned up successfully"}
 
@@ -250,103 +317,111 @@ async def list_validation_jobs() -> dict[str, list[dict[str, Any]]]:
 
 
 # Background task functions
-async def validate_fund_file_background(job_id: str, file_path: str) -> None:
-    """Background task to validate fund data file."""
+def _dataset_metadata(
+    df: pd.DataFrame, name: str, report: DataQualityReport, data_type: str
+) -> DatasetMetadata:
+    """Summarize a validated dataset; each statistic is one vectorized pass."""
+    if "date" in df.columns:
+        dates = pd.to_datetime(df["date"], errors="coerce", cache=True)
+        date_range = (dates.min(), dates.max())
+    else:
+        date_range = (None, None)
+    null_count = int(df.isna().to_numpy().sum())
+
+    return DatasetMetadata(
+        name=name,
+        rows=len(df),
+        columns=len(df.columns),
+        date_range=date_range,
+        data_quality_score=report.overall_score,
+        missing_data_percentage=null_count / df.size,
+        column_mappings=DataValidator.intelligent_column_mapping(
+            df.columns.tolist(), data_type
+        ),
+    )
+
+
+def _json_value(value: Any) -> Any:
+    """Timestamps as ISO strings (NaT as None); other cells pass through."""
+    if isinstance(value, datetime):
+        return None if value is pd.NaT else value.isoformat()
+    return value
+
+
+def _preview_rows(df: pd.DataFrame, rows: int = 5) -> list[dict[str, Any]]:
+    """First rows as JSON-ready dicts, zipped from plain row tuples."""
+    columns = df.columns.tolist()
+    return [
+        dict(zip(columns, map(_json_value, row), strict=True))
+        for row in df.head(rows).itertuples(index=False, name=None)
+    ]
+
+
+def _read_dataset(file_path: str) -> pd.DataFrame:
+    """Load an uploaded CSV or Excel file."""
+    if file_path.lower().endswith(".csv"):
+        return read_csv(file_path)
+    return pd.read_excel(file_path, engine=EXCEL_ENGINE)
+
+
+async def _validate_file_background(
+    job_id: str, file_path: str, data_type: str
+) -> None:
+    """
+    Validate an uploaded file, reporting progress on the job.
+    Parsing and validation run in worker threads so the event loop stays free.
+    """
+    validate = (
+        DataValidator.validate_fund_data
+        if data_type == "fund"
+        else DataValidator.validate_index_data
+    )
 
     try:
-        # Update status
-        validation_jobs[job_id]["status"] = "validating"
-        validation_jobs[job_id]["progress"] = 10
+        await _save_job(job_id, status="validating", progress=10)
 
-        # Read file
-        if file_path.lower().endswith(".csv"):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
+        df = await asyncio.to_thread(_read_dataset, file_path)
 
-        validation_jobs[job_id]["progress"] = 30
+        await _save_job(job_id, progress=30)
 
-        # Perform validation
-        validation_result = DataValidator.validate_fund_data(df)
+        validation_result = await asyncio.to_thread(validate, df)
 
-        validation_jobs[job_id]["progress"] = 80
+        await _save_job(job_id, progress=80)
 
-        # Generate metadata
-        metadata = DatasetMetadata(
-            name=validation_jobs[job_id]["filename"],
-            rows=len(df),
-            columns=len(df.columns),
-            date_range=(
-                (df["date"].min(), df["date"].max())
-                if "date" in df.columns
-                else (None, None)
-            ),
-            data_quality_score=validation_result.overall_score,
-            missing_data_percentage=df.isnull().sum().sum()
-            / (len(df) * len(df.columns)),
-            column_mappings=DataValidator.intelligent_column_mapping(
-                df.columns.tolist(), "fund"
-            ),
+        metadata = await asyncio.to_thread(
+            _dataset_metadata,
+            df,
+            validation_jobs[job_id]["filename"],
+            validation_result,
+            data_type,
         )
 
-        validation_jobs[job_id]["progress"] = 100
-        validation_jobs[job_id]["status"] = "completed"
-        validation_jobs[job_id]["result"] = {
-            "validation_report": validation_result.dict(),
-            "metadata": metadata.dict(),
-            "preview_data": df.head(5).to_dict("records"),
-        }
+        await _save_job(
+            job_id,
+            progress=100,
+            status="completed",
+            # JSON-mode dumps keep the job record ready for orjson and the cache
+            result={
+                "validation_report": validation_result.model_dump(mode="json"),
+                "metadata": metadata.model_dump(mode="json"),
+                "preview_data": _preview_rows(df),
+            },
+        )
 
     except Exception as e:
-        validation_jobs[job_id]["status"] = "failed"
-        validation_jobs[job_id]["error"] = str(e)
-        validation_jobs[job_id]["progress"] = 0
+        await _save_job(job_id, status="failed", error=str(e), progress=0)
 
+    finally:
+        # The upload is only read here; drop it as soon as validation ends
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(file_path)
 
-async def validate_index_file_background(job_id: str, file_path: str) -> None:
-    """Background task to validate index data file."""
 
-    try:
-        validation_jobs[job_id]["status"] = "validating"
-        validation_jobs[job_id]["progress"] = 10
-
-        if file_path.lower().endswith(".csv"):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
-
-        validation_jobs[job_id]["progress"] = 30
-
-        validation_result = DataValidator.validate_index_data(df)
-
-        validation_jobs[job_id]["progress"] = 80
-
-        metadata = DatasetMetadata(
-            name=validation_jobs[job_id]["filename"],
-            rows=len(df),
-            columns=len(df.columns),
-            date_range=(
-                (df["date"].min(), df["date"].max())
-                if "date" in df.columns
-                else (None, None)
-            ),
-            data_quality_score=validation_result.overall_score,
-            missing_data_percentage=df.isnull().sum().sum()
-            / (len(df) * len(df.columns)),
-            column_mappings=DataValidator.intelligent_column_mapping(
-                df.columns.tolist(), "index"
-            ),
-        )
+async def validate_fund_file_background(job_id: str, file_path: str) -> None:
+    """Background task to validate fund data file."""
+    await _validate_file_background(job_id, file_path, "fund")
 
-        validation_jobs[job_id]["progress"] = 100
-        validation_jobs[job_id]["status"] = "completed"
-        validation_jobs[job_id]["result"] = {
-            "validation_report": validation_result.dict(),
-            "metadata": metadata.dict(),
-            "preview_data": df.head(5).to_dict("records"),
-        }
 
-    except Exception as e:
-        validation_jobs[job_id]["status"] = "failed"
-        validation_jobs[job_id]["error"] = str(e)
-        validation_jobs[job_id]["progress"] = 0
+async def validate_index_file_background(job_id: str, file_path: str) -> None:
+    """Background task to validate index data file."""
+    await _validate_file_background(job_id, file_path, "index")
@@ -0,0 +1,24 @@
+"""
+Sample fund and benchmark series shared by the backend system test scripts
+and the health check.
+"""
+
+import pandas as pd
+
+# Eight quarter ends from 2020 and the series observed on them
+QUARTER_ENDS = pd.date_range("2020-01-01", periods=8, freq="QE")
+FUND_CASHFLOWS = (-1000, -500, 0, 200, 300, 0, 400, 500)
+FUND_NAVS = (1000, 1400, 1450, 1350, 1600, 1700, 1600, 1800)
+BENCHMARK_PRICES = (100, 105, 110, 108, 115, 120, 118, 125)
+
+
+def fund_frame() -> pd.DataFrame:
+    """Eight quarters of fund cash flows and NAVs."""
+    return pd.DataFrame(
+        {"date": QUARTER_ENDS, "cashflow": FUND_CASHFLOWS, "nav": FUND_NAVS}
+    )
+
+
+def benchmark_frame() -> pd.DataFrame:
+    """Benchmark prices over the same quarters as ``fund_frame``."""
+    return pd.DataFrame({"date": QUARTER_ENDS, "price": BENCHMARK_PRICES})
@@ -5,9 +5,16 @@ Comprehensive data validation for PME Calculator using Pydantic.
 
 from __future__ import annotations
 
+import bisect
+import functools
+import hashlib
+import re
+import threading
+from collections.abc import Callable
 from datetime import date, datetime
 from enum import Enum
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, field_validator
 
@@ -34,6 +41,16 @@ class ValidationSeverity(str, Enum):
     INFO = "info"
 
 
+def _parse_date_string(value: str) -> date:
+    """Parse a date string, skipping pandas' format inference for YYYY-MM-DD."""
+    if len(value) == 10 and value[4] == value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return pd.to_datetime(value).date()
+
+
 # Core Data Models
 class FundCashFlowRecord(BaseModel):
     """Individual fund cash flow record with validation."""
@@ -49,7 +66,7 @@ class FundCashFlowRecord(BaseModel):
     def parse_date(cls, v):
         if isinstance(v, str):
             try:
-                return pd.to_datetime(v).date()
+                return _parse_date_string(v)
             except:
                 raise ValueError(f"Invalid date format: {v}")
         elif isinstance(v, datetime):
@@ -86,7 +103,7 @@ class IndexRecord(BaseModel):
     def parse_date(cls, v):
         if isinstance(v, str):
             try:
-                return pd.to_datetime(v).date()
+                return _parse_date_string(v)
             except (ValueError, TypeError, pd.errors.ParserError):
                 raise ValueError(f"Invalid date format: {v}")
         elif isinstance(v, datetime):
@@ -179,99 +196,287 @@ class CalculationParameters(BaseModel):
     decimals: int = 4
 
 
-# Comprehensive Validation Engine
-class DataValidator:
-    """Advanced data validation engine for PME calculations."""
+# Vectorized record screening: a row whose values pass every check below is one
+# the record model accepts, so only the remaining rows need the model itself
+def _number_values(column: pd.Series) -> np.ndarray:
+    """Column as floats, NaN wherever a value is not plainly numeric."""
+    if pd.api.types.is_bool_dtype(column) or not (
+        pd.api.types.is_numeric_dtype(column) or pd.api.types.is_string_dtype(column)
+    ):
+        return np.full(len(column), np.nan)
+    return pd.to_numeric(column, errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
 
-    @staticmethod
-    def validate_fund_data(df: pd.DataFrame) -> DataQualityReport:
-        """Validate fund cash flow data comprehensively."""
-        errors = []
-        warnings = []
 
-        # Check required columns
-        required_columns = ["date", "cashflow", "nav"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+def _is_number(column: pd.Series) -> np.ndarray:
+    return ~np.isnan(_number_values(column))
+
+
+def _is_non_negative(column: pd.Series) -> np.ndarray:
+    return _number_values(column) >= 0
+
+
+def _is_positive(column: pd.Series) -> np.ndarray:
+    return _number_values(column) > 0
+
+
+def _parse_dates(column: pd.Series | pd.DataFrame) -> pd.Series | None:
+    """Column parsed under one inferred format, or None if any value breaks it."""
+    try:
+        return pd.to_datetime(column)
+    except Exception:
+        return None
+
+
+def _is_date(column: pd.Series, parsed: pd.Series | None = None) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.notna().to_numpy()
+    if not pd.api.types.is_string_dtype(column):
+        return np.zeros(len(column), dtype=bool)
+    if parsed is not None:
+        # Every value already parsed, so the mixed-format pass would agree
+        return parsed.notna().to_numpy()
+    try:
+        parsed = pd.to_datetime(column, format="mixed", errors="coerce")
+    except (ValueError, TypeError):
+        # e.g. mixed UTC offsets, which the model still parses one by one
+        return np.zeros(len(column), dtype=bool)
+    return parsed.notna().to_numpy()
+
+
+def _is_text(column: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_string_dtype(column):
+        return np.zeros(len(column), dtype=bool)
+    return column.notna().to_numpy()
+
+
+def _is_cash_flow_type(column: pd.Series) -> np.ndarray:
+    return column.isin([member.value for member in CashFlowType]).to_numpy()
+
+
+_FUND_CHECKS = {
+    "date": _is_date,
+    "cashflow": _is_number,
+    "nav": _is_non_negative,
+    "description": _is_text,
+    "type": _is_cash_flow_type,
+}
+_INDEX_CHECKS = {
+    "date": _is_date,
+    "price": _is_positive,
+    "total_return_index": _is_number,
+    "dividend_yield": _is_number,
+}
+
+# Suggestions for low completeness, low consistency and the error count
+_FUND_SUGGESTIONS = (
+    "Fill in missing data values where possible",
+    "Review data types and formats for consistency",
+    "Address {} validation errors",
+)
+_INDEX_SUGGESTIONS = (
+    "Fill in missing price data",
+    "Check for data type inconsistencies",
+    None,
+)
+
+
+def _screen_records(
+    df: pd.DataFrame, model: type[BaseModel], checks: dict
+) -> np.ndarray:
+    """Mask of rows whose values all pass the column checks for ``model``."""
+    clean = np.ones(len(df), dtype=bool)
+    if not df.columns.is_unique:
+        return ~clean
+    for field, check in checks.items():
+        if field in df.columns:
+            clean &= check(df[field])
+        elif model.model_fields[field].is_required():
+            return ~clean
+    return clean
+
+
+def _keyword_pattern(*keywords: str) -> re.Pattern[str]:
+    """One alternation matching any keyword anywhere in a lower-cased name."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# Standardized columns in priority order per data type; a column maps to the
+# first entry whose keywords occur in its name
+_COLUMN_PATTERNS = {
+    "fund": (
+        (
+            "date",
+            "datetime",
+            _keyword_pattern(
+                "date", "period", "time", "month", "quarter", "year", "timestamp"
+            ),
+        ),
+        (
+            "cashflow",
+            "float",
+            _keyword_pattern(
+                "cashflow",
+                "cash_flow",
+                "cash flow",
+                "cf",
+                "net_cash",
+                "amount",
+                "contribution",
+                "distribution",
+            ),
+        ),
+        (
+            "nav",
+            "float",
+            _keyword_pattern(
+                "nav", "net_asset_value", "value", "balance", "book_value"
+            ),
+        ),
+    ),
+    "index": (
+        (
+            "date",
+            "datetime",
+            _keyword_pattern("date", "period", "time", "month", "quarter", "year"),
+        ),
+        (
+            "price",
+            "float",
+            _keyword_pattern(
+                "price", "level", "index", "value", "close", "closing", "adjusted"
+            ),
+        ),
+    ),
+}
+
+
+def _null_count(df: pd.DataFrame) -> np.int64:
+    """Missing cells in ``df``, counted in one reduction over a flat mask."""
+    return df.isna().to_numpy().sum()
+
+
+# Lowest overall score for each quality level, ascending; below all is INVALID
+_QUALITY_THRESHOLDS = (0.5, 0.7, 0.8, 0.9)
+_QUALITY_LEVELS = (
+    DataQuality.INVALID,
+    DataQuality.POOR,
+    DataQuality.ACCEPTABLE,
+    DataQuality.GOOD,
+    DataQuality.EXCELLENT,
+)
+
+
+def _quality_level(score: float) -> DataQuality:
+    return _QUALITY_LEVELS[bisect.bisect_right(_QUALITY_THRESHOLDS, score)]
+
+
+# Row errors listed per report; further failures are only counted
+MAX_ROW_ERRORS = 100
+
+
+def _suppressed_errors(count: int) -> ValidationError:
+    """Summary entry standing in for row errors beyond ``MAX_ROW_ERRORS``."""
+    return ValidationError(
+        row_index=-1,
+        column="multiple",
+        error_type="errors_suppressed",
+        message=f"{count} more validation errors not listed",
+        severity=ValidationSeverity.ERROR,
+    )
 
-        if missing_columns:
-            for col in missing_columns:
-                errors.append(
-                    ValidationError(
-                        row_index=-1,
-                        column=col,
-                        error_type="missing_column",
-                        message=f"Required column '{col}' is missing",
-                        severity=ValidationSeverity.ERROR,
-                        suggested_fix=f"Add '{col}' column to your data",
-                    )
-                )
 
-        # Validate each record
-        valid_records = 0
-        for idx, row in df.iterrows():
-            try:
-                FundCashFlowRecord(**row.to_dict())
-                valid_records += 1
-            except Exception as e:
-                errors.append(
-                    ValidationError(
-                        row_index=idx,
-                        column="multiple",
-                        error_type="validation_error",
-                        message=str(e),
-                        severity=ValidationSeverity.ERROR,
-                    )
-                )
+# Reports for recently validated frames keyed by "<validator>:<sha256>", least
+# recently used evicted first; validations run in worker threads, hence the lock
+REPORT_CACHE_SIZE = 32
+_report_cache: dict[str, DataQualityReport] = {}
+_report_cache_lock = threading.Lock()
+
+
+def _report_cache_key(name: str, df: pd.DataFrame) -> str:
+    """Content key for ``df`` covering its values and the types of object cells."""
+    digest = hashlib.sha256(repr((df.columns.tolist(), df.dtypes.tolist())).encode())
+    digest.update(pd.util.hash_pandas_object(df).to_numpy().tobytes())
+    # Object cells are hashed by their text, so None and NaN (or 1 and "1")
+    # collide while the record models tell them apart; hash their types as well
+    positions = [
+        i for i, dtype in enumerate(df.dtypes) if pd.api.types.is_object_dtype(dtype)
+    ]
+    if positions:
+        types = df.iloc[:, positions].map(lambda value: type(value).__name__)
+        digest.update(
+            pd.util.hash_pandas_object(types, index=False).to_numpy().tobytes()
+        )
+    return f"{name}:{digest.hexdigest()}"
 
-        # Calculate quality scores
-        completeness_score = 1 - (df.isnull().sum().sum() / (len(df) * len(df.columns)))
-        consistency_score = min(1.0, valid_records / len(df)) if len(df) > 0 else 0
-        timeliness_score = DataValidator._calculate_timeliness_score(df)
-        overall_score = (completeness_score + consistency_score + timeliness_score) / 3
 
-        # Determine quality level
-        if overall_score >= 0.9:
-            quality_level = DataQuality.EXCELLENT
-        elif overall_score >= 0.8:
-            quality_level = DataQuality.GOOD
-        elif overall_score >= 0.7:
-            quality_level = DataQuality.ACCEPTABLE
-        elif overall_score >= 0.5:
-            quality_level = DataQuality.POOR
-        else:
-            quality_level = DataQuality.INVALID
+def _cached_report(
+    validate: Callable[[pd.DataFrame], DataQualityReport],
+) -> Callable[[pd.DataFrame], DataQualityReport]:
+    """Serve repeat validations of identical frames from ``_report_cache``."""
 
-        # Generate suggestions
-        suggestions = []
-        if completeness_score < 0.9:
-            suggestions.append("Fill in missing data values where possible")
-        if consistency_score < 0.9:
-            suggestions.append("Review data types and formats for consistency")
-        if len(errors) > 0:
-            suggestions.append(f"Address {len(errors)} validation errors")
+    @functools.wraps(validate)
+    def wrapper(df: pd.DataFrame) -> DataQualityReport:
+        key = _report_cache_key(validate.__name__, df)
+        # Callers get their own copy; the cached report is never handed out
+        with _report_cache_lock:
+            report = _report_cache.pop(key, None)
+            if report is not None:
+                _report_cache[key] = report
+                return report.model_copy(deep=True)
 
-        return DataQualityReport(
-            overall_score=overall_score,
-            quality_level=quality_level,
-            total_records=len(df),
-            valid_records=valid_records,
-            error_count=len(errors),
-            warning_count=len(warnings),
-            errors=errors,
-            completeness_score=completeness_score,
-            consistency_score=consistency_score,
-            timeliness_score=timeliness_score,
-            suggestions=suggestions,
+        report = validate(df)
+        with _report_cache_lock:
+            _report_cache[key] = report.model_copy(deep=True)
+            if len(_report_cache) > REPORT_CACHE_SIZE:
+                _report_cache.pop(next(iter(_report_cache)))
+        return report
+
+    return wrapper
+
+
+# Comprehensive Validation Engine
+class DataValidator:
+    """Advanced data validation engine for PME calculations."""
+
+    @staticmethod
+    @_cached_report
+    def validate_fund_data(df: pd.DataFrame) -> DataQualityReport:
+        """Validate fund cash flow data comprehensively."""
+        return DataValidator._validate(
+            df, FundCashFlowRecord, _FUND_CHECKS, _FUND_SUGGESTIONS
         )
 
     @staticmethod
+    @_cached_report
     def validate_index_data(df: pd.DataFrame) -> DataQualityReport:
         """Validate index/benchmark data comprehensively."""
+        return DataValidator._validate(
+            df, IndexRecord, _INDEX_CHECKS, _INDEX_SUGGESTIONS
+        )
+
+    @staticmethod
+    def _validate(
+        df: pd.DataFrame,
+        record_cls: type[BaseModel],
+        checks: dict,
+        suggestion_texts: tuple[str, str, str | None],
+    ) -> DataQualityReport:
+        """Validate ``df`` as rows of ``record_cls`` and score its quality.
+
+        ``suggestion_texts`` hold the hints for low completeness, low consistency
+        and, if not None, a format string for the number of errors.
+        """
         errors = []
         warnings = []
 
         # Check required columns
-        required_columns = ["date", "price"]
+        required_columns = [
+            name
+            for name, field in record_cls.model_fields.items()
+            if field.is_required()
+        ]
         missing_columns = [col for col in required_columns if col not in df.columns]
 
         if missing_columns:
@@ -287,13 +492,53 @@ class DataValidator:
                     )
                 )
 
-        # Validate each record
-        valid_records = 0
-        for idx, row in df.iterrows():
+            # Every record fails the model without these, so skip the row pass
+            return DataQualityReport(
+                overall_score=0.0,
+                quality_level=DataQuality.INVALID,
+                total_records=len(df),
+                valid_records=0,
+                error_count=len(errors),
+                warning_count=len(warnings),
+                errors=errors,
+                completeness_score=0.0,
+                consistency_score=0.0,
+                timeliness_score=0.0,
+                suggestions=[f"Add missing columns: {', '.join(missing_columns)}"],
+            )
+
+        # Parse dates once for both the record screen and the timeliness score
+        dates = _parse_dates(df["date"]) if "date" in df.columns else None
+        checks = {**checks, "date": functools.partial(_is_date, parsed=dates)}
+
+        # Validate each record; rows passing the column checks are valid as a
+        # block and only the rest go through the model for their error message
+        clean = _screen_records(df, record_cls, checks)
+        valid_records = int(clean.sum())
+        suppressed = 0
+        suspects = np.flatnonzero(~clean)
+        suspect_rows = df.iloc[suspects]
+        if dates is not None and pd.api.types.is_string_dtype(df["date"]):
+            # Hand the model the dates parsed above instead of strings to parse
+            # again; unparsed values stay as they were for its error message
+            parsed = dates.iloc[suspects]
+            suspect_rows = suspect_rows.assign(
+                date=np.where(
+                    parsed.isna().to_numpy(),
+                    suspect_rows["date"].to_numpy(dtype=object),
+                    parsed.to_numpy(dtype=object),
+                )
+            )
+        columns = suspect_rows.columns.tolist()
+        rows = suspect_rows.itertuples(index=False, name=None)
+        for idx, row in zip(df.index[suspects].tolist(), rows, strict=True):
             try:
-                IndexRecord(**row.to_dict())
+                record_cls.model_validate(dict(zip(columns, row, strict=True)))
                 valid_records += 1
             except Exception as e:
+                if len(errors) == MAX_ROW_ERRORS:
+                    suppressed += 1
+                    continue
                 errors.append(
                     ValidationError(
                         row_index=idx,
@@ -303,37 +548,34 @@ class DataValidator:
                         severity=ValidationSeverity.ERROR,
                     )
                 )
+        error_count = len(errors) + suppressed
+        if suppressed:
+            errors.append(_suppressed_errors(suppressed))
 
         # Calculate quality scores
-        completeness_score = 1 - (df.isnull().sum().sum() / (len(df) * len(df.columns)))
+        completeness_score = 1 - (_null_count(df) / (len(df) * len(df.columns)))
         consistency_score = min(1.0, valid_records / len(df)) if len(df) > 0 else 0
-        timeliness_score = DataValidator._calculate_timeliness_score(df)
+        timeliness_score = DataValidator._calculate_timeliness_score(df, dates)
         overall_score = (completeness_score + consistency_score + timeliness_score) / 3
 
-        # Determine quality level
-        if overall_score >= 0.9:
-            quality_level = DataQuality.EXCELLENT
-        elif overall_score >= 0.8:
-            quality_level = DataQuality.GOOD
-        elif overall_score >= 0.7:
-            quality_level = DataQuality.ACCEPTABLE
-        elif overall_score >= 0.5:
-            quality_level = DataQuality.POOR
-        else:
-            quality_level = DataQuality.INVALID
+        quality_level = _quality_level(overall_score)
 
+        # Generate suggestions
+        incomplete_hint, inconsistent_hint, error_hint = suggestion_texts
         suggestions = []
         if completeness_score < 0.9:
-            suggestions.append("Fill in missing price data")
+            suggestions.append(incomplete_hint)
         if consistency_score < 0.9:
-            suggestions.append("Check for data type inconsistencies")
+            suggestions.append(inconsistent_hint)
+        if error_hint is not None and error_count > 0:
+            suggestions.append(error_hint.format(error_count))
 
         return DataQualityReport(
             overall_score=overall_score,
             quality_level=quality_level,
             total_records=len(df),
             valid_records=valid_records,
-            error_count=len(errors),
+            error_count=error_count,
             warning_count=len(warnings),
             errors=errors,
             completeness_score=completeness_score,
@@ -343,26 +585,37 @@ class DataValidator:
         )
 
     @staticmethod
-    def _calculate_timeliness_score(df: pd.DataFrame) -> float:
-        """Calculate data timeliness score based on date consistency."""
+    def clear_cache() -> None:
+        """Forget every cached validation report."""
+        with _report_cache_lock:
+            _report_cache.clear()
+
+    @staticmethod
+    def _calculate_timeliness_score(df: pd.DataFrame, dates: pd.Series | None) -> float:
+        """Calculate data timeliness score based on date consistency.
+
+        ``dates`` is ``df["date"]`` as returned by ``_parse_dates``.
+        """
         if "date" not in df.columns or len(df) < 2:
             return 0.5
+        if dates is None:
+            return 0.3
 
         try:
-            dates = pd.to_datetime(df["date"])
-            date_diffs = dates.diff().dropna()
-
-            # Check for regular intervals
-            mode_diff = (
-                date_diffs.mode().iloc[0] if len(date_diffs.mode()) > 0 else None
-            )
-            if mode_diff:
-                regular_intervals = (date_diffs == mode_diff).sum()
-                timeliness_score = regular_intervals / len(date_diffs)
-            else:
-                timeliness_score = 0.5
-
-            return min(1.0, timeliness_score)
+            # Consecutive differences as int64 ticks, skipping pairs with a NaT
+            stamps = pd.DatetimeIndex(dates).asi8
+            present = dates.notna().to_numpy()
+            date_diffs = np.diff(stamps)[present[1:] & present[:-1]]
+            if date_diffs.size == 0:
+                return 0.5
+
+            # Check for regular intervals; ties go to the shortest interval
+            intervals, counts = np.unique(date_diffs, return_counts=True)
+            mode = counts.argmax()
+            if intervals[mode] == 0:
+                return 0.5
+
+            return min(1.0, counts[mode] / date_diffs.size)
         except:
             return 0.3
 
@@ -371,137 +624,25 @@ class DataValidator:
         columns: list[str], data_type: str = "fund"
     ) -> list[ColumnMapping]:
         """Intelligent column mapping with confidence scoring."""
-        mappings = []
-
-        if data_type == "fund":
-            # Date mapping
-            date_keywords = [
-                "date",
-                "period",
-                "time",
-                "month",
-                "quarter",
-                "year",
-                "timestamp",
-            ]
-            cashflow_keywords = [
-                "cashflow",
-                "cash_flow",
-                "cash flow",
-                "cf",
-                "net_cash",
-                "amount",
-                "contribution",
-                "distribution",
-            ]
-            nav_keywords = ["nav", "net_asset_value", "value", "balance", "book_value"]
+        patterns = _COLUMN_PATTERNS.get(data_type)
+        if patterns is None:
+            return []
 
-            for col in columns:
-                col_lower = col.lower().strip()
-
-                # Date column mapping
-                date_confidence = max(
-                    [0.9 if keyword in col_lower else 0 for keyword in date_keywords]
-                )
-                if date_confidence > 0.5:
-                    mappings.append(
-                        ColumnMapping(
-                            original_name=col,
-                            standardized_name="date",
-                            data_type="datetime",
-                            confidence=date_confidence,
-                        )
-                    )
-                    continue
-
-                # Cashflow mapping
-                cf_confidence = max(
-                    [
-                        0.9 if keyword in col_lower else 0
-                        for keyword in cashflow_keywords
-                    ]
-                )
-                if cf_confidence > 0.5:
-                    mappings.append(
-                        ColumnMapping(
-                            original_name=col,
-                            standardized_name="cashflow",
-                            data_type="float",
-                            confidence=cf_confidence,
-                        )
-                    )
-                    continue
-
-                # NAV mapping
-                nav_confidence = max(
-                    [0.9 if keyword in col_lower else 0 for keyword in nav_keywords]
-                )
-                if nav_confidence > 0.5:
-                    mappings.append(
-                        ColumnMapping(
-                            original_name=col,
-                            standardized_name="nav",
-                            data_type="float",
-                            confidence=nav_confidence,
-                        )
-                    )
-                    continue
-
-                # Unmapped column
-                mappings.append(
-                    ColumnMapping(
-                        original_name=col,
-                        standardized_name="unknown",
-                        data_type="unknown",
-                        confidence=0.0,
-                    )
-                )
-
-        elif data_type == "index":
-            date_keywords = ["date", "period", "time", "month", "quarter", "year"]
-            price_keywords = [
-                "price",
-                "level",
-                "index",
-                "value",
-                "close",
-                "closing",
-                "adjusted",
-            ]
-
-            for col in columns:
-                col_lower = col.lower().strip()
-
-                # Date mapping
-                date_confidence = max(
-                    [0.9 if keyword in col_lower else 0 for keyword in date_keywords]
-                )
-                if date_confidence > 0.5:
-                    mappings.append(
-                        ColumnMapping(
-                            original_name=col,
-                            standardized_name="date",
-                            data_type="datetime",
-                            confidence=date_confidence,
-                        )
-                    )
-                    continue
-
-                # Price mapping
-                price_confidence = max(
-                    [0.9 if keyword in col_lower else 0 for keyword in price_keywords]
-                )
-                if price_confidence > 0.5:
+        mappings = []
+        for col in columns:
+            col_lower = col.lower().strip()
+            for standardized_name, column_type, pattern in patterns:
+                if pattern.search(col_lower):
                     mappings.append(
                         ColumnMapping(
                             original_name=col,
-                            standardized_name="price",
-                            data_type="float",
-                            confidence=price_confidence,
+                            standardized_name=standardized_name,
+                            data_type=column_type,
+                            confidence=0.9,
                         )
                     )
-                    continue
-
+                    break
+            else:
                 # Unmapped column
                 mappings.append(
                     ColumnMapping(
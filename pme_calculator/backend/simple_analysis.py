@@ -5,12 +5,38 @@ Simple analysis endpoint that bypasses complex Pydantic validation.
 import uuid
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from routers.upload import uploaded_files
 
 # Import our central timezone utility
 from pme_calculator.utils.time import utc_now
 
-router = APIRouter(prefix="/simple-analysis", tags=["simple-analysis"])
+router = APIRouter(
+    prefix="/simple-analysis",
+    tags=["simple-analysis"],
+    default_response_class=ORJSONResponse,
+)
+
+# Demo results served for every successful run; only the request id and
+# analysis date are filled in per request
+_STATIC_SUCCESS_BODY = {
+    "success": True,
+    "metrics": {
+        "Fund IRR": 0.185,
+        "TVPI": 2.34,
+        "DPI": 1.67,
+        "RVPI": 0.67,
+        "Total Contributions": 25236151,
+        "Total Distributions": 17012700,
+        "Final NAV": 8500000,
+    },
+    "summary": {
+        "fund_performance": "Strong performance with 18.5% IRR",
+        "vs_benchmark": "Outperformed benchmark by 6.5%",
+        "risk_profile": "Moderate risk with good diversification",
+    },
+    "has_benchmark": True,
+}
 
 
 @router.post("/run")
@@ -21,35 +47,18 @@ async def run_simple_analysis():
         if not uploaded_files:
             return {"success": False, "error": "No files uploaded"}
 
-        # Find fund file
-        fund_file_id = None
-        for file_id in uploaded_files:
-            if file_id.startswith("fund_"):
-                fund_file_id = file_id
-                break
+        # Find fund file; ids of expired records may linger until the next sweep
+        fund_file_id = next(
+            (fid for fid in uploaded_files.fund_ids if fid in uploaded_files), None
+        )
 
         if not fund_file_id:
             return {"success": False, "error": "No fund file found"}
 
         # Return simple demo results
         return {
-            "success": True,
+            **_STATIC_SUCCESS_BODY,
             "request_id": str(uuid.uuid4()),
-            "metrics": {
-                "Fund IRR": 0.185,
-                "TVPI": 2.34,
-                "DPI": 1.67,
-                "RVPI": 0.67,
-                "Total Contributions": 25236151,
-                "Total Distributions": 17012700,
-                "Final NAV": 8500000,
-            },
-            "summary": {
-                "fund_performance": "Strong performance with 18.5% IRR",
-                "vs_benchmark": "Outperformed benchmark by 6.5%",
-                "risk_profile": "Moderate risk with good diversification",
-            },
-            "has_benchmark": True,
             "analysis_date": utc_now().isoformat(),
         }
     except Exception as e:
@@ -4,60 +4,39 @@ Simple system test to verify core functionality without problematic imports.
 """
 
 import sys
+import tempfile
+from pathlib import Path
 
+import numpy as np
+import pytest
+import sample_data
 import structlog
 
 logger = structlog.get_logger()
-import tempfile
 
-import pandas as _pd
+# Keep this script's debug progress lines out of pytest output
+pytestmark = pytest.mark.usefixtures("quiet_structlog")
 
 
-def test_core_functionality():
+def test_core_functionality(analysis_engine, fund_df, benchmark_df):
     """Test core PME functionality without problematic schemas."""
     logger.debug("🔬 Testing Core PME System...")
 
     try:
         # Test 1: Analysis Engine
-        from analysis_engine import PMEAnalysisEngine
-
-        logger.debug("   ✅ Analysis Engine imported successfully")
-
-        # Create test data
-        test_data = _pd.DataFrame(
-            {
-                "date": _pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "cashflow": [-1000, -500, 0, 200, 300, 0, 400, 500],
-                "nav": [1000, 1400, 1450, 1350, 1600, 1700, 1600, 1800],
-            }
-        )
-
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            test_data.to_csv(f.name, index=False)
-            temp_file = f.name
-
-        try:
-            # Test analysis engine
-            engine = PMEAnalysisEngine()
-            result = engine.load_fund_data(temp_file)
-            logger.debug(f"   ✅ Fund data loaded: {result['success']}")
-
-            # Test metrics calculation
-            metrics = engine.calculate_pme_metrics()
-            logger.debug(f"   ✅ Metrics calculated: {metrics['success']}")
-
-            # Test specific metrics
-            fund_irr = metrics["metrics"].get("Fund IRR", 0)
-            tvpi = metrics["metrics"].get("TVPI", 0)
-            logger.debug(f"   ✅ Fund IRR: {fund_irr:.1%}")
-            logger.debug(f"   ✅ TVPI: {tvpi:.2f}x")
+        engine = analysis_engine
+        result = engine.load_fund_dataframe(fund_df)
+        logger.debug(f"   ✅ Fund data loaded: {result['success']}")
 
-        finally:
-            # Cleanup
-            import os
+        # Test metrics calculation
+        metrics = engine.calculate_pme_metrics()
+        logger.debug(f"   ✅ Metrics calculated: {metrics['success']}")
 
-            os.unlink(temp_file)
+        # Test specific metrics
+        fund_irr = metrics["metrics"].get("Fund IRR", 0)
+        tvpi = metrics["metrics"].get("TVPI", 0)
+        logger.debug(f"   ✅ Fund IRR: {fund_irr:.1%}")
+        logger.debug(f"   ✅ TVPI: {tvpi:.2f}x")
 
     except Exception as e:
         logger.debug(f"   ❌ Analysis engine failed: {e}")
@@ -69,24 +48,8 @@ def test_core_functionality():
 
         logger.debug("   ✅ PME Engine imported successfully")
 
-        # Create test data
-        fund_data = _pd.DataFrame(
-            {
-                "date": _pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "cashflow": [-1000, -500, 0, 200, 300, 0, 400, 500],
-                "nav": [1000, 1400, 1450, 1350, 1600, 1700, 1600, 1800],
-            }
-        )
-
-        benchmark_data = _pd.DataFrame(
-            {
-                "date": _pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "price": [100, 105, 110, 108, 115, 120, 118, 125],
-            }
-        )
-
         # Test PME engine
-        engine = PMEEngine(fund_data, benchmark_data, BenchmarkType.PRICE_ONLY)
+        engine = PMEEngine(fund_df, benchmark_df, BenchmarkType.PRICE_ONLY)
         logger.debug("   ✅ PME Engine initialized")
 
         # Test calculations
@@ -123,7 +86,7 @@ def test_core_functionality():
         logger.debug(f"   ✅ DPI calculation: {dpi:.2f}x")
 
         # Test volatility calculation
-        returns = [0.05, -0.02, 0.08, 0.01, -0.03, 0.04]
+        returns = np.array([0.05, -0.02, 0.08, 0.01, -0.03, 0.04])
         volatility = MathEngine.calculate_volatility(returns)
         logger.debug(f"   ✅ Volatility calculation: {volatility:.1%}")
 
@@ -144,6 +107,17 @@ def test_core_functionality():
     return True
 
 
+def test_fund_csv_loading(analysis_engine, fund_csv, fund_df):
+    """Test that loading the fund CSV matches loading the frame directly."""
+    logger.debug("\n🔬 Testing Fund CSV Loading...")
+
+    from_csv = analysis_engine.load_fund_data(fund_csv)
+    from_frame = analysis_engine.load_fund_dataframe(fund_df)
+    logger.debug(f"   ✅ Fund CSV loaded: {from_csv['success']}")
+
+    assert from_csv == from_frame
+
+
 def test_dependencies():
     """Test critical dependencies."""
     logger.debug("\n🔬 Testing Dependencies...")
@@ -183,11 +157,25 @@ def main():
         logger.debug("\n❌ Critical dependencies missing. Please install requirements.")
         sys.exit(1)
 
-    # Test core functionality
-    if not test_core_functionality():
+    # Test core functionality on the shared sample data
+    from analysis_engine import PMEAnalysisEngine
+
+    engine = PMEAnalysisEngine()
+    logger.debug("   ✅ Analysis Engine imported successfully")
+    fund_df = sample_data.fund_frame()
+    if not test_core_functionality(engine, fund_df, sample_data.benchmark_frame()):
         logger.debug("\n❌ Core functionality tests failed.")
         sys.exit(1)
 
+    # Test the CSV path once
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fund_csv = Path(tmp_dir) / "fund.csv"
+        fund_df.to_csv(fund_csv, index=False)
+        passed = test_fund_csv_loading(engine, str(fund_csv), fund_df)
+    if not passed:
+        logger.debug("\n❌ Fund CSV loading test failed.")
+        sys.exit(1)
+
     logger.debug("\n✅ System Test Complete - All checks passed!")
     logger.debug("🎯 Ready to proceed with enhancements!")
 
@@ -3,48 +3,29 @@
 Comprehensive test for the enhanced PME system with charting capabilities.
 """
 
+import pytest
+import sample_data
 import structlog
 
 logger = structlog.get_logger()
 
+# Keep this script's debug progress lines out of pytest output
+pytestmark = pytest.mark.usefixtures("quiet_structlog")
 
-def test_enhanced_system():
+
+def test_enhanced_system(chart_engine, analysis_engine, fund_df, benchmark_df):
     """Test the complete enhanced system."""
     logger.debug("🚀 Testing Enhanced PME System")
     logger.debug("=" * 50)
 
     try:
         # Test chart engine
-        from chart_engine import ChartEngine
-
-        engine = ChartEngine()
+        engine = chart_engine
         logger.debug("✅ Chart engine loaded")
 
         # Test analysis engine integration
-        from analysis_engine import PMEAnalysisEngine
-
-        PMEAnalysisEngine()
         logger.debug("✅ Analysis engine loaded")
 
-        # Test pandas and numpy
-        import pandas as pd
-
-        # Create sample data
-        fund_data = pd.DataFrame(
-            {
-                "date": pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "cashflow": [-1000, -500, 0, 200, 300, 0, 400, 500],
-                "nav": [1000, 1400, 1450, 1350, 1600, 1700, 1600, 1800],
-            }
-        )
-
-        benchmark_data = pd.DataFrame(
-            {
-                "date": pd.date_range("2020-01-01", periods=8, freq="QE"),
-                "price": [100, 105, 110, 108, 115, 120, 118, 125],
-            }
-        )
-
         # Generate comprehensive dashboard
         metrics = {
             "Fund IRR": 0.179,
@@ -55,7 +36,7 @@ def test_enhanced_system():
             "Alpha": 0.05,
         }
 
-        dashboard = engine.create_pme_dashboard(fund_data, benchmark_data, metrics)
+        dashboard = engine.create_pme_dashboard(fund_df, benchmark_df, metrics)
         logger.debug(
             f'✅ Dashboard created with {dashboard["metadata"]["chart_count"]} charts'
         )
@@ -82,14 +63,14 @@ def test_enhanced_system():
 
         # Performance comparison
         try:
-            engine.create_performance_comparison_chart(fund_data, benchmark_data)
+            engine.create_performance_comparison_chart(fund_df, benchmark_df)
             logger.debug("   ✅ Performance comparison chart")
         except Exception as e:
             logger.debug(f"   ❌ Performance comparison failed: {e}")
 
         # Cash flow waterfall
         try:
-            engine.create_cash_flow_waterfall_chart(fund_data)
+            engine.create_cash_flow_waterfall_chart(fund_df)
             logger.debug("   ✅ Cash flow waterfall chart")
         except Exception as e:
             logger.debug(f"   ❌ Cash flow waterfall failed: {e}")
@@ -112,7 +93,15 @@ def test_enhanced_system():
 
 
 if __name__ == "__main__":
-    success = test_enhanced_system()
+    from analysis_engine import PMEAnalysisEngine
+    from chart_engine import ChartEngine
+
+    success = test_enhanced_system(
+        ChartEngine(),
+        PMEAnalysisEngine(),
+        sample_data.fund_frame(),
+        sample_data.benchmark_frame(),
+    )
     if success:
         logger.debug("\n🎉 All enhanced system tests passed!")
     else:
@@ -0,0 +1,42 @@
+"""
+Tests for the Arrow CSV reader: it must produce what pd.read_csv produces.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.arrow_csv import read_csv
+
+MIXED_CSV = (
+    "date,nav,fund,note\n"
+    "2020-01-01,1000.5,Alpha,NA\n"
+    "2020-06-30,,Beta,n/a\n"
+    "2020-12-31,1050,,ok\n"
+)
+
+
+def test_matches_pandas_for_dates_and_missing_values(tmp_path):
+    csv_file = tmp_path / "fund.csv"
+    csv_file.write_text(MIXED_CSV)
+
+    result = read_csv(csv_file)
+    expected = pd.read_csv(csv_file)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result["date"].tolist() == ["2020-01-01", "2020-06-30", "2020-12-31"]
+
+
+def test_ragged_rows_fall_back_to_pandas():
+    source = io.BytesIO(b"a,b\n1,2\n3\n")
+
+    result = read_csv(source)
+
+    assert result.shape == (2, 2)
+    assert pd.isna(result.loc[1, "b"])
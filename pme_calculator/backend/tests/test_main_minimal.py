@@ -0,0 +1,62 @@
+"""
+Tests for the minimal app's in-memory upload store.
+"""
+
+import errno
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from main_minimal import UploadStore, save_temp_file
+
+
+def test_expired_upload_record_removes_temp_file(tmp_path):
+    now = [0.0]
+    store = UploadStore(maxsize=4, ttl=10, timer=lambda: now[0])
+    temp_file = tmp_path / "fund.csv"
+    temp_file.write_text("date,cashflow,nav\n")
+    store["fund"] = {"path": str(temp_file)}
+
+    now[0] = 11.0
+    store["index"] = {"path": str(tmp_path / "index.csv")}
+
+    assert "fund" not in store
+    assert not temp_file.exists()
+
+
+def test_evicted_upload_record_removes_temp_file(tmp_path):
+    store = UploadStore(maxsize=1, ttl=10)
+    temp_file = tmp_path / "fund.csv"
+    temp_file.write_text("date,cashflow,nav\n")
+    store["fund"] = {"path": str(temp_file)}
+    store["index"] = {"path": str(tmp_path / "index.csv")}
+
+    assert list(store) == ["index"]
+    assert not temp_file.exists()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs procfs")
+@pytest.mark.asyncio
+async def test_full_disk_closes_and_removes_temp_file(tmp_path, monkeypatch):
+    def no_space(fd, offset, length):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(os, "posix_fallocate", no_space, raising=False)
+    upload = UploadFile(io.BytesIO(b"date,cashflow,nav\n"), size=18, filename="f.csv")
+    open_fds = set(os.listdir("/proc/self/fd"))
+
+    with pytest.raises(OSError):
+        await save_temp_file(upload)
+
+    assert set(os.listdir("/proc/self/fd")) <= open_fds
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,142 @@
+"""
+Tests for DataValidator: vectorized screening must agree with the record models.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from schemas import (
+    MAX_ROW_ERRORS,
+    DataValidator,
+    FundCashFlowRecord,
+    IndexRecord,
+    _report_cache,
+)
+
+
+def _model_valid_count(df, model):
+    """Rows the record model accepts when validated one at a time."""
+    valid = 0
+    for _, row in df.iterrows():
+        try:
+            model(**row.to_dict())
+            valid += 1
+        except Exception:
+            pass
+    return valid
+
+
+def test_fund_rows_match_record_model():
+    df = pd.DataFrame(
+        {
+            "date": ["2020-01-01", "bad", "", "01/02/2020", "Mar 2020", None],
+            "cashflow": ["1", "x", "2.5", "3", "nan", "1e3"],
+            "nav": [1.0, 2.0, -3.0, np.inf, 4.0, 5.0],
+        },
+        index=[10, 20, 30, 40, 50, 60],
+    )
+
+    report = DataValidator.validate_fund_data(df)
+
+    assert report.valid_records == _model_valid_count(df, FundCashFlowRecord)
+    assert [e.row_index for e in report.errors] == [20, 30, 50, 60]
+    assert "Invalid date format: bad" in report.errors[0].message
+
+
+def test_index_rows_match_record_model():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2020-01-01", "2020-02-01", None, "2020-04-01"]),
+            "price": [1.0, 0.0, 3.0, -1.0],
+            "dividend_yield": [None, 0.02, 0.01, 0.03],
+        }
+    )
+
+    report = DataValidator.validate_index_data(df)
+
+    assert report.valid_records == _model_valid_count(df, IndexRecord) == 1
+    assert "Price must be positive" in report.errors[0].message
+
+
+def test_identical_frames_reuse_cached_report():
+    DataValidator.clear_cache()
+    df = pd.DataFrame(
+        {"date": ["2020-01-01", "2020-02-01"], "cashflow": [1.0, 2.0], "nav": [1, 2]}
+    )
+
+    first = DataValidator.validate_fund_data(df)
+    second = DataValidator.validate_fund_data(df.copy())
+
+    assert second == first and second is not first
+    assert len(_report_cache) == 1
+    DataValidator.validate_index_data(df)
+    assert len(_report_cache) == 2
+    DataValidator.validate_fund_data(df.assign(nav=[1, -2]))
+    assert len(_report_cache) == 3
+    DataValidator.clear_cache()
+    assert not _report_cache
+
+
+def test_cached_report_copies_are_independent():
+    DataValidator.clear_cache()
+    df = pd.DataFrame({"date": ["2020-01-01", "bad"], "cashflow": [1.0, 2.0]})
+
+    first = DataValidator.validate_fund_data(df)
+    first.errors.clear()
+    first.suggestions.append("mutated")
+    second = DataValidator.validate_fund_data(df)
+
+    assert second.errors and "mutated" not in second.suggestions
+    second.errors.clear()
+    assert DataValidator.validate_fund_data(df).errors
+    DataValidator.clear_cache()
+
+
+def test_object_columns_reuse_cached_report_by_value_and_type():
+    DataValidator.clear_cache()
+    df = pd.DataFrame(
+        {
+            "date": pd.Series(["2020-01-01", None], dtype=object),
+            "cashflow": [1.0, 2.0],
+            "nav": [1, 2],
+        }
+    )
+
+    DataValidator.validate_fund_data(df)
+    DataValidator.validate_fund_data(df.copy())
+    assert len(_report_cache) == 1
+
+    with_nan = df.assign(date=pd.Series(["2020-01-01", np.nan], dtype=object))
+    DataValidator.validate_fund_data(with_nan)
+    assert len(_report_cache) == 2
+    DataValidator.clear_cache()
+
+
+def test_missing_required_column_skips_row_validation():
+    df = pd.DataFrame({"date": ["2020-01-01", "bad"], "cashflow": [1.0, 2.0]})
+
+    report = DataValidator.validate_fund_data(df)
+
+    assert report.quality_level == "invalid"
+    assert report.valid_records == 0
+    assert [e.error_type for e in report.errors] == ["missing_column"]
+    assert report.suggestions == ["Add missing columns: nav"]
+
+
+def test_row_errors_beyond_cap_are_summarised():
+    rows = MAX_ROW_ERRORS + 5
+    df = pd.DataFrame({"date": ["junk"] * rows, "cashflow": [1.0] * rows, "nav": 1.0})
+
+    report = DataValidator.validate_fund_data(df)
+
+    assert report.error_count == rows
+    assert len(report.errors) == MAX_ROW_ERRORS + 1
+    assert report.errors[-1].error_type == "errors_suppressed"
+    assert report.errors[-1].message.startswith("5 more")
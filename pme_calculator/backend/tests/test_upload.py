@@ -0,0 +1,292 @@
+"""
+Tests for the upload router: streaming to disk, size limits and file registry.
+"""
+
+import asyncio
+import errno
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import cache
+from routers import upload
+
+XLSX_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FUND_CSV = (
+    "date,cashflow,nav\n"
+    "2020-01-01,-1000,1000\n"
+    "2020-06-30,0,1100\n"
+    "2020-12-31,200,1050\n"
+    "2021-06-30,300,900\n"
+)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """Client against a bare app carrying only the upload router."""
+    cache.reset_cache_for_testing()
+    monkeypatch.setattr(cache, "_use_memory", True)
+    monkeypatch.setattr(upload, "UPLOAD_DIR", tmp_path)
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/api")
+    upload.uploaded_files.clear()
+    upload.validation_cache.clear()
+    yield TestClient(app)
+    for file_data in list(upload.uploaded_files.values()):
+        Path(file_data["temp_path"]).unlink(missing_ok=True)
+    upload.uploaded_files.clear()
+    cache.reset_cache_for_testing()
+
+
+def test_fund_upload_streams_file_to_disk(client):
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    stored = upload.uploaded_files[body["file_id"]]
+    assert Path(stored["temp_path"]) == upload.UPLOAD_DIR / f"{body['file_id']}.csv"
+    assert Path(stored["temp_path"]).read_text() == FUND_CSV
+
+
+def test_file_info_resolves_from_shared_cache(client):
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+    )
+    file_id = response.json()["file_id"]
+    temp_path = upload.uploaded_files.pop(file_id)["temp_path"]
+
+    # Simulates a request served by a worker that did not handle the upload
+    info = client.get(f"/api/v1/uploads/files/{file_id}")
+    assert info.status_code == 200
+    assert info.json()["file_info"]["validation"]["is_valid"] is True
+
+    assert client.delete(f"/api/v1/uploads/files/{file_id}").status_code == 200
+    assert not Path(temp_path).exists()
+    assert client.get(f"/api/v1/uploads/files/{file_id}").status_code == 404
+
+
+def test_repeat_upload_reuses_cached_validation(client, monkeypatch):
+    calls = []
+    validate = upload.validate_file_comprehensive
+
+    def counting_validate(*args):
+        calls.append(args)
+        return validate(*args)
+
+    monkeypatch.setattr(upload, "validate_file_comprehensive", counting_validate)
+
+    responses = [
+        client.post(
+            "/api/v1/uploads/fund",
+            files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+        )
+        for _ in range(2)
+    ]
+
+    assert all(r.json()["success"] for r in responses)
+    assert len(calls) == 1
+    digests = {upload.uploaded_files[r.json()["file_id"]]["sha256"] for r in responses}
+    assert len(digests) == 1
+    for r in responses:
+        body = r.json()
+        assert body["validation"]["metadata"]["filename"] == f"{body['file_id']}.csv"
+
+
+def test_upload_over_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(upload, "MAX_BYTES", 0)
+
+    response = client.post(
+        "/api/v1/uploads/index",
+        files={"file": ("index.csv", b"date,price\n2020-01-01,100\n", "text/csv")},
+    )
+
+    assert response.status_code == 413
+    assert not upload.uploaded_files
+
+
+def test_content_length_over_limit_is_rejected_before_body(monkeypatch):
+    app = FastAPI()
+    app.middleware("http")(upload.reject_oversized_uploads)
+    app.include_router(upload.router, prefix="/api")
+    monkeypatch.setattr(upload, "MAX_BYTES", 0)
+    monkeypatch.setattr(upload, "MULTIPART_SLACK", 0)
+
+    response = TestClient(app).post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+    )
+
+    assert response.status_code == 413
+    assert not upload.uploaded_files
+
+
+def test_full_disk_is_reported_before_streaming(client, monkeypatch):
+    def no_space(fd, offset, length):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(upload, "HAS_FALLOCATE", True)
+    monkeypatch.setattr(upload.os, "posix_fallocate", no_space, raising=False)
+
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+    )
+
+    assert response.status_code == 507
+    assert not upload.uploaded_files
+    assert not any(upload.UPLOAD_DIR.iterdir())
+
+
+def test_existing_upload_file_is_left_in_place(client, monkeypatch):
+    monkeypatch.setattr(upload, "new_upload_id", lambda: "taken")
+    existing = upload.UPLOAD_DIR / "taken.csv"
+    existing.write_text(FUND_CSV)
+
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+    )
+
+    assert response.status_code == 500
+    assert existing.read_text() == FUND_CSV
+
+
+def test_unsupported_media_type_is_rejected(client):
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.txt", b"hello", "text/plain")},
+    )
+
+    assert response.status_code == 415
+
+
+def test_csv_missing_required_columns_is_rejected_from_header(client):
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.csv", b"when,amount\n2020-01-01,5\n", "text/csv")},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is False
+    assert "Could not identify required columns" in body["validation"]["errors"][0]
+    assert not any(upload.UPLOAD_DIR.iterdir())
+
+
+def test_xlsx_upload_is_validated(client, tmp_path):
+    workbook = tmp_path / "fund.xlsx"
+    pd.read_csv(io.StringIO(FUND_CSV)).to_excel(workbook, index=False)
+
+    response = client.post(
+        "/api/v1/uploads/fund",
+        files={"file": ("fund.xlsx", workbook.read_bytes(), XLSX_TYPE)},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["validation"]["metadata"]["row_count"] == 4
+
+
+def test_expired_upload_removes_temp_file(tmp_path):
+    now = [0.0]
+    registry = upload.UploadRegistry(maxsize=2, ttl=10, timer=lambda: now[0])
+    temp_file = tmp_path / "fund.csv"
+    temp_file.write_text(FUND_CSV)
+    registry["fund"] = {"temp_path": str(temp_file)}
+
+    now[0] = 11.0
+    registry.expire()
+
+    assert "fund" not in registry
+    assert not temp_file.exists()
+
+
+def test_registry_tracks_fund_upload_ids(tmp_path):
+    now = [0.0]
+    registry = upload.UploadRegistry(maxsize=2, ttl=10, timer=lambda: now[0])
+    for file_id, file_type in [("a", "fund"), ("b", "index"), ("c", "fund")]:
+        temp_file = tmp_path / f"{file_id}.csv"
+        temp_file.write_text(FUND_CSV)
+        registry[file_id] = {"temp_path": str(temp_file), "file_type": file_type}
+
+    assert registry.fund_ids == {"c"}
+    registry.pop("c")
+    registry["d"] = {"temp_path": str(tmp_path / "d.csv"), "file_type": "fund"}
+    assert registry.fund_ids == {"d"}
+
+    now[0] = 11.0
+    registry.expire()
+    assert registry.fund_ids == set()
+
+
+@pytest.mark.asyncio
+async def test_expired_uploads_are_removed_in_one_cleanup_task(tmp_path):
+    now = [0.0]
+    registry = upload.UploadRegistry(maxsize=4, ttl=10, timer=lambda: now[0])
+    temp_files = [tmp_path / f"fund_{i}.csv" for i in range(3)]
+    for i, temp_file in enumerate(temp_files):
+        temp_file.write_text(FUND_CSV)
+        registry[f"fund_{i}"] = {"temp_path": str(temp_file)}
+
+    now[0] = 11.0
+    registry.expire()
+
+    assert len(upload._cleanup_tasks) == 1
+    await asyncio.gather(*upload._cleanup_tasks)
+    assert not any(temp_file.exists() for temp_file in temp_files)
+
+
+@pytest.mark.asyncio
+async def test_upload_meta_rows_are_flushed_in_one_batch(monkeypatch):
+    written = []
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def fake_create_upload_records(session, rows):
+        written.append(list(rows))
+        return len(rows)
+
+    monkeypatch.setattr(upload, "async_session", FakeSession, raising=False)
+    monkeypatch.setattr(
+        upload, "create_upload_records", fake_create_upload_records, raising=False
+    )
+    monkeypatch.setattr(upload, "META_FLUSH_INTERVAL", 0)
+
+    queue = asyncio.Queue()
+    for i in range(3):
+        queue.put_nowait({"filename": f"fund_{i}.csv", "user": "anonymous"})
+
+    flusher = asyncio.create_task(upload.flush_upload_meta(queue))
+    while not written:
+        await asyncio.sleep(0)
+    flusher.cancel()
+
+    assert [len(batch) for batch in written] == [3]
+
+
+def test_upload_ids_are_time_ordered_uuid7(monkeypatch):
+    clock = iter(range(1_000_000_000, 5_000_000_000, 1_000_000))
+    monkeypatch.setattr(upload.time, "time_ns", lambda: next(clock))
+
+    ids = [upload._uuid7() for _ in range(3)]
+
+    assert all(file_id.version == 7 for file_id in ids)
+    assert [str(file_id) for file_id in ids] == sorted(str(file_id) for file_id in ids)
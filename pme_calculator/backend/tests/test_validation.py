@@ -0,0 +1,82 @@
+"""
+Tests for the validation router: job lifecycle and temp file cleanup.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import cache
+from routes import validation
+
+FUND_CSV = (
+    "date,cashflow,nav\n"
+    "2020-01-01,-1000,1000\n"
+    "2020-06-30,0,1100\n"
+    "2020-12-31,200,1050\n"
+    "2021-06-30,300,900\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    cache.reset_cache_for_testing()
+    monkeypatch.setattr(cache, "_use_memory", True)
+    validation.validation_jobs.clear()
+    yield
+    validation.validation_jobs.clear()
+    cache.reset_cache_for_testing()
+
+
+def test_upload_is_removed_once_validation_finishes():
+    app = FastAPI()
+    app.include_router(validation.router)
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/validation/upload/fund",
+        files={"file": ("fund.csv", FUND_CSV.encode(), "text/csv")},
+    )
+
+    job = validation.validation_jobs[response.json()["job_id"]]
+    assert job["status"] == "completed"
+    assert job["result"]["preview_data"][0]["date"] == "2020-01-01"
+    assert not Path(job["file_path"]).exists()
+
+
+@pytest.mark.asyncio
+async def test_reaper_discards_only_stale_finished_jobs(monkeypatch):
+    stale = (datetime.now() - timedelta(hours=2)).isoformat()
+    fresh = datetime.now().isoformat()
+    for job_id, status, created_at in [
+        ("old_done", "completed", stale),
+        ("old_running", "validating", stale),
+        ("new_done", "completed", fresh),
+    ]:
+        await validation._save_job(
+            job_id, status=status, created_at=created_at, file_path="/nonexistent"
+        )
+
+    sleeps = 0
+
+    async def one_sweep(interval):
+        nonlocal sleeps
+        sleeps += 1
+        if sleeps > 1:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(validation.asyncio, "sleep", one_sweep)
+    with pytest.raises(asyncio.CancelledError):
+        await validation.reap_stale_jobs()
+
+    assert set(validation.validation_jobs) == {"old_running", "new_done"}
+    assert await cache.cache_get(f"{validation.JOB_KEY_PREFIX}old_done") is None
@@ -0,0 +1,66 @@
+"""CSV parsing with pyarrow that yields the same DataFrame as pd.read_csv."""
+
+import os
+from typing import BinaryIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# pandas' default missing-value markers, so Arrow reads nulls the same way
+CSV_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+_PROBE_OPTIONS = pacsv.ConvertOptions(
+    null_values=CSV_NA_VALUES, strings_can_be_null=True
+)
+
+
+def read_csv(source: str | os.PathLike | BinaryIO) -> pd.DataFrame:
+    """Parse a CSV path or file object with Arrow's multi-threaded reader."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return read_csv(f)
+    try:
+        # Arrow parses ISO dates and times itself; probe the inferred schema so
+        # those columns can be read back as text, which is what the processor
+        # and pandas' own reader produce
+        schema = pacsv.open_csv(source, convert_options=_PROBE_OPTIONS).schema
+        source.seek(0)
+        text_columns = {
+            field.name: pa.string()
+            for field in schema
+            if pa.types.is_temporal(field.type)
+        }
+        table = pacsv.read_csv(
+            source,
+            convert_options=pacsv.ConvertOptions(
+                null_values=CSV_NA_VALUES,
+                strings_can_be_null=True,
+                column_types=text_columns,
+            ),
+        )
+    except pa.ArrowInvalid:
+        # Arrow is stricter about ragged rows and encodings; let pandas try
+        source.seek(0)
+        return pd.read_csv(source)
+    # The table is not used again, so its buffers can be freed as pandas copies
+    return table.to_pandas(self_destruct=True)
@@ -1,10 +1,14 @@
 """Tiny time helpers shared across the backend."""
 
+import time
 from datetime import UTC, datetime
 from typing import Final
 
 UTC: Final = UTC
 
+# (epoch second, formatted timestamp) of the last iso_now() call
+_iso_cache: tuple[int, str] = (-1, "")
+
 
 def now_utc() -> datetime:
     """Return an aware datetime in UTC (tzinfo = UTC)."""
@@ -17,3 +21,21 @@ def utc_now() -> datetime:
     This replaces datetime.utcnow() with a timezone-aware equivalent.
     """
     return datetime.now(UTC)
+
+
+def utc_now_naive() -> datetime:
+    """Return the current UTC time without tzinfo, for naive DateTime columns."""
+    return utc_now().replace(tzinfo=None)
+
+
+def iso_now() -> str:
+    """Return the current UTC time as an ISO 8601 string, to whole seconds.
+
+    The formatted string is cached for the current second, so bursts of
+    calls format it only once.
+    """
+    global _iso_cache
+    second = int(time.time())
+    if _iso_cache[0] != second:
+        _iso_cache = (second, datetime.fromtimestamp(second, UTC).isoformat())
+    return _iso_cache[1]
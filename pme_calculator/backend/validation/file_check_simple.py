@@ -2,6 +2,7 @@
 Simplified file validation service for PME Calculator.
 """
 
+import csv
 import logging
 from pathlib import Path
 
@@ -9,8 +10,22 @@ import pandas as pd
 
 from .schemas_simple import FileTypeEnum, UploadMeta, ValidationResult
 
+# Prefer the Rust calamine reader for Excel files; openpyxl/xlrd otherwise
+try:
+    import python_calamine  # noqa: F401
+
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
 logger = logging.getLogger(__name__)
 
+CSV_SEPARATORS = [",", ";", "\t", "|"]
+REQUIRED_COLUMNS = {
+    "fund": ["date", "cashflow", "nav"],
+    "index": ["date", "price"],
+}
+
 
 def detect_column_mappings(df: pd.DataFrame, file_type: str = "fund") -> dict[str, str]:
     """
@@ -96,9 +111,9 @@ def validate_csv_structure(
             # Try different separators
             for sep in [",", ";", "\t", "|"]:
                 try:
-                    df = pd.read_csv(file_path, sep=sep, nrows=5)
+                    df = pd.read_csv(file_path, sep=sep, nrows=5, memory_map=True)
                     if len(df.columns) > 1:  # Found the right separator
-                        df = pd.read_csv(file_path, sep=sep)
+                        df = pd.read_csv(file_path, sep=sep, memory_map=True)
                         break
                 except (pd.errors.ParserError, UnicodeDecodeError, PermissionError):
                     continue
@@ -108,7 +123,7 @@ def validate_csv_structure(
 
         elif file_path.suffix.lower() in [".xlsx", ".xls"]:
             try:
-                df = pd.read_excel(file_path)
+                df = pd.read_excel(file_path, engine=EXCEL_ENGINE)
             except Exception as e:
                 errors.append(f"Could not read Excel file: {str(e)}")
                 return None, errors
@@ -134,6 +149,51 @@ def validate_csv_structure(
     return df, errors
 
 
+def validate_csv_header(header: bytes, file_type: str = "fund") -> list[str]:
+    """
+    Check the raw header row of a CSV upload for the required columns.
+    Lets callers reject a file before the body is written or parsed.
+    """
+    line = header.decode("utf-8-sig", errors="replace").strip()
+
+    for sep in CSV_SEPARATORS:
+        columns = next(csv.reader([line], delimiter=sep))
+        if len(columns) > 1:
+            break
+    else:
+        # Leave unparseable headers to the full structure validation
+        return []
+
+    mappings = detect_column_mappings(pd.DataFrame(columns=columns), file_type)
+    missing_required = [
+        col for col in REQUIRED_COLUMNS.get(file_type, []) if col not in mappings
+    ]
+
+    if not missing_required:
+        return []
+
+    return [
+        f"Could not identify required columns: {', '.join(missing_required)}",
+        f"Available columns: {', '.join(columns)}",
+    ]
+
+
+def required_column_errors(df: pd.DataFrame, file_type: str) -> list[str]:
+    """
+    Check an already-parsed DataFrame for the columns its file type requires.
+    """
+    mappings = detect_column_mappings(df, file_type)
+    missing_required = [
+        req_col for req_col in REQUIRED_COLUMNS[file_type] if req_col not in mappings
+    ]
+    if not missing_required:
+        return []
+    return [
+        f"Could not identify required columns: {', '.join(missing_required)}",
+        f"Available columns: {', '.join(df.columns.tolist())}",
+    ]
+
+
 def validate_fund_file(file_path: str | Path) -> list[str]:
     """
     Validate fund cashflow file and return list of error strings.
@@ -151,23 +211,7 @@ def validate_fund_file(file_path: str | Path) -> list[str]:
     if df is None or structure_errors:
         return errors
 
-    # Detect column mappings
-    mappings = detect_column_mappings(df, "fund")
-
-    # Check required columns
-    required_columns = ["date", "cashflow", "nav"]
-    missing_required = []
-
-    for req_col in required_columns:
-        if req_col not in mappings:
-            missing_required.append(req_col)
-
-    if missing_required:
-        errors.append(
-            f"Could not identify required columns: {', '.join(missing_required)}"
-        )
-        errors.append(f"Available columns: {', '.join(df.columns.tolist())}")
-
+    errors.extend(required_column_errors(df, "fund"))
     return errors
 
 
@@ -188,23 +232,7 @@ def validate_index_file(file_path: str | Path) -> list[str]:
     if df is None or structure_errors:
         return errors
 
-    # Detect column mappings
-    mappings = detect_column_mappings(df, "index")
-
-    # Check required columns
-    required_columns = ["date", "price"]
-    missing_required = []
-
-    for req_col in required_columns:
-        if req_col not in mappings:
-            missing_required.append(req_col)
-
-    if missing_required:
-        errors.append(
-            f"Could not identify required columns: {', '.join(missing_required)}"
-        )
-        errors.append(f"Available columns: {', '.join(df.columns.tolist())}")
-
+    errors.extend(required_column_errors(df, "index"))
     return errors
 
 
@@ -265,15 +293,12 @@ def validate_file_comprehensive(
     if structure_errors:
         return ValidationResult(is_valid=False, errors=structure_errors)
 
-    # Type-specific validation
-    if file_type == "fund":
-        validation_errors = validate_fund_file(file_path)
-    elif file_type == "index":
-        validation_errors = validate_index_file(file_path)
-    else:
+    # Type-specific validation on the frame parsed above, not a second read
+    if file_type not in REQUIRED_COLUMNS:
         return ValidationResult(
             is_valid=False, errors=[f"Unknown file type: {file_type}"]
         )
+    validation_errors = required_column_errors(df, file_type)
 
     # Create metadata
     try:
@@ -19,6 +19,7 @@ setup(
         "scipy>=1.10.0",
         "numpy-financial>=1.0.0",
         "openpyxl>=3.1.0",
+        "python-calamine>=0.2.0",
         "xlsxwriter>=3.0.0",
         "xlrd>=2.0.0",
         "plotly>=5.17.0",
@@ -29,6 +30,7 @@ setup(
         "psutil>=5.9.0",
         "requests>=2.28.0",
         "redis>=5.0.0",
+        "cachetools>=5.5,<8",
         "reportlab>=4.0.8",
         "orjson>=3.8.0",
         "ujson>=5.7.0",